@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""Incremental build: run only the pipeline stages whose inputs changed.
+
+Each stage is a script in scripts/ with declared inputs and outputs. A stage
+is fingerprinted by the content hash of its inputs (plus its own script) and
+skipped when the fingerprint matches the last successful build. Stages that
+do not share files run in parallel.
+
+A stage that did part of its work (e.g. a batch of a longer backlog) exits
+with EXIT_INCOMPLETE: later stages still run, but it is not fingerprinted,
+so the next build runs it again even if its inputs did not change.
+Optional stages (enrichment that later stages can do without) are treated
+the same way when they fail: the failure is reported and retried next
+build, but does not hold back the rest of the pipeline.
+
+Usage: python scripts/build.py [--force] [stage ...]
+"""
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import date
+
+from curated_sources import CURATED_SOURCES
+from exit_codes import EXIT_INCOMPLETE
+from localize_feeds import LOCALES, cache_path, output_path
+
+STATE_PATH = ".build-state.json"
+FEEDS_PATH = "feeds.json"
+VALIDATION_PATH = "validation.json"
+GENERATE_SOURCE = "../zen-wallpapers/s-grade-curated.json"
+MAX_WORKERS = 4
+
+
+class Stage:
+    """A build step: a script run from the zen-feeds root."""
+
+    def __init__(self, name, script, inputs, outputs, args=(), optional=False):
+        self.name = name
+        self.script = os.path.join("scripts", script)
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.args = list(args)
+        self.optional = optional
+
+    def command(self):
+        return [sys.executable, self.script] + self.args
+
+
+# Declaration order breaks ties between stages that touch the same file.
+# Stages must be idempotent: rerunning on their own output is a no-op.
+STAGES = [
+    # Optional: needs numpy and Pillow; without quality.json unscored items
+    # keep the default score
+    Stage("quality", "quality.py",
+          inputs=CURATED_SOURCES + ["scripts/curated_sources.py", "mirror/index.json",
+                                    "scripts/mirror.py"],
+          outputs=["quality.json"],
+          optional=True),
+    Stage("sync", "reconcile_curated.py",
+          inputs=CURATED_SOURCES + ["scripts/curated_sources.py", "scripts/sync_new_curated.py",
+                                    "scripts/tagger.py", FEEDS_PATH,
+                                    "curated_base.json", "tombstones.json", "quality.json"],
+          outputs=[FEEDS_PATH, "curated_base.json", "changeset.json"]),
+    # Captions only what sync added (changeset.json), never the whole catalog
+    Stage("captions", "generate_unique_captions.py",
+          inputs=[FEEDS_PATH, "changeset.json"],
+          outputs=[FEEDS_PATH],
+          args=["--changeset", "changeset.json"]),
+    Stage("generate", "generate_feeds.py",
+          inputs=[GENERATE_SOURCE, FEEDS_PATH, "scripts/rate_control.py",
+                  "scripts/generation_backends.py", "scripts/http_pool.py", "scripts/tagger.py"],
+          outputs=[FEEDS_PATH]),
+    Stage("dims", "image_dims.py",
+          inputs=[FEEDS_PATH, "image_dims.json", "mirror/index.json", "scripts/mirror.py",
+                  "scripts/http_pool.py"],
+          outputs=[FEEDS_PATH]),
+    # Publishing stages read validation.json, so they only run on a valid feed
+    Stage("validate", "validate_feeds.py",
+          inputs=[FEEDS_PATH, "scripts/tagger.py", "scripts/curated_sources.py"],
+          outputs=[VALIDATION_PATH],
+          args=["--report", VALIDATION_PATH]),
+    Stage("locales", "localize_feeds.py",
+          inputs=[FEEDS_PATH, VALIDATION_PATH, "scripts/generate_feeds.py", "scripts/rate_control.py",
+                  "scripts/generation_backends.py", "scripts/http_pool.py", "scripts/validate_feeds.py"],
+          outputs=[output_path(loc) for loc in LOCALES] + [cache_path(loc) for loc in LOCALES]),
+    Stage("tags", "tagger.py",
+          inputs=CURATED_SOURCES + ["scripts/curated_sources.py", FEEDS_PATH, VALIDATION_PATH],
+          outputs=["tags.json"]),
+    Stage("prerender", "prerender.py",
+          inputs=[FEEDS_PATH, VALIDATION_PATH, "index.html"],
+          outputs=["index.html"]),
+    Stage("syndication", "syndication.py",
+          inputs=[FEEDS_PATH, VALIDATION_PATH, "scripts/curated_sources.py"],
+          outputs=["syndication/manifest.json"]),
+    Stage("index", "record_index.py",
+          inputs=[FEEDS_PATH, VALIDATION_PATH],
+          outputs=["feeds.rec", "feeds.idx"],
+          args=["build"]),
+    # The date is part of the fingerprint, so today.json is rebuilt daily;
+    # rotation.json keeps the days already planned
+    Stage("today", "rotation.py",
+          inputs=[FEEDS_PATH, VALIDATION_PATH],
+          outputs=["today.json", "rotation.json"],
+          args=["--date", date.today().isoformat()]),
+    Stage("similar", "similar.py",
+          inputs=[FEEDS_PATH, VALIDATION_PATH, "tags.json", "mirror/index.json", "scripts/mirror.py",
+                  "scripts/http_pool.py"],
+          outputs=["similar.json"]),
+]
+
+
+def load_state():
+    if os.path.exists(STATE_PATH):
+        with open(STATE_PATH, 'r') as f:
+            return json.load(f)
+    return {"files": {}, "stages": {}}
+
+
+def save_state(state):
+    tmp = STATE_PATH + ".tmp"
+    with open(tmp, 'w') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp, STATE_PATH)
+
+
+def file_hash(path, cache):
+    """Content hash of a file, reusing the cached hash while size/mtime match."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return "-"
+    cached = cache.get(path)
+    if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+        return cached[2]
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    digest = h.hexdigest()
+    cache[path] = [st.st_size, st.st_mtime_ns, digest]
+    return digest
+
+
+def fingerprint(stage, cache):
+    h = hashlib.sha256()
+    h.update(json.dumps(stage.command()[1:]).encode())
+    for path in sorted(set(stage.inputs + [stage.script])):
+        h.update(f"{path}\0{file_hash(path, cache)}\n".encode())
+    return h.hexdigest()
+
+
+def dependencies(stages):
+    """Map each stage to the earlier stages whose outputs it reads or rewrites."""
+    deps = {}
+    for i, stage in enumerate(stages):
+        touched = set(stage.inputs) | set(stage.outputs)
+        deps[stage.name] = {
+            other.name for other in stages[:i] if touched & set(other.outputs)
+        }
+    return deps
+
+
+def run_stage(stage):
+    start = time.time()
+    result = subprocess.run(stage.command(), capture_output=True, text=True)
+    return result, time.time() - start
+
+
+def build(stages, force=False):
+    state = load_state()
+    cache = state["files"]
+    deps = dependencies(stages)
+    by_name = {s.name: s for s in stages}
+
+    pending = [s.name for s in stages]
+    done, failed, incomplete = set(), set(), set()
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        while pending or running:
+            for name in list(pending):
+                if deps[name] & failed:
+                    pending.remove(name)
+                    failed.add(name)
+                    print(f"[{name}] skipped: dependency failed")
+                    continue
+                if not deps[name] <= done:
+                    continue
+                pending.remove(name)
+                stage = by_name[name]
+                missing = [p for p in stage.outputs if not os.path.exists(p)]
+                if (not force and not missing
+                        and state["stages"].get(name) == fingerprint(stage, cache)):
+                    done.add(name)
+                    print(f"[{name}] up to date")
+                    continue
+                running[pool.submit(run_stage, stage)] = name
+
+            if not running:
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                result, elapsed = future.result()
+                for line in result.stdout.splitlines():
+                    print(f"[{name}] {line}")
+                if result.returncode == 0:
+                    done.add(name)
+                    print(f"[{name}] done in {elapsed:.1f}s")
+                elif result.returncode == EXIT_INCOMPLETE:
+                    done.add(name)
+                    incomplete.add(name)
+                    print(f"[{name}] done in {elapsed:.1f}s, more left for the next build")
+                else:
+                    for line in result.stderr.splitlines():
+                        print(f"[{name}] {line}", file=sys.stderr)
+                    if by_name[name].optional:
+                        done.add(name)
+                        incomplete.add(name)
+                        print(f"[{name}] failed with exit code {result.returncode} (optional, continuing)")
+                    else:
+                        failed.add(name)
+                        print(f"[{name}] failed with exit code {result.returncode}")
+
+    # Fingerprint against the final tree: a stage that already ran (or was
+    # current) is up to date with respect to what later stages wrote.
+    for name in done - incomplete:
+        state["stages"][name] = fingerprint(by_name[name], cache)
+    for name in failed | incomplete:
+        state["stages"].pop(name, None)
+    save_state(state)
+    return not failed
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    os.chdir(os.path.dirname(script_dir))  # Go to zen-feeds root
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("stages", nargs="*", help="stages to run (default: all)")
+    parser.add_argument("--force", action="store_true", help="ignore fingerprints")
+    args = parser.parse_args()
+
+    names = [s.name for s in STAGES]
+    unknown = [n for n in args.stages if n not in names]
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)} (choose from {', '.join(names)})")
+    stages = [s for s in STAGES if not args.stages or s.name in args.stages]
+
+    start = time.time()
+    ok = build(stages, force=args.force)
+    print(f"Build {'finished' if ok else 'FAILED'} in {time.time() - start:.2f}s")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""Stream and merge curated wallpaper sources for the sync scripts."""
+import heapq
+import json
+import os
+import re
+from datetime import datetime
+
+# Curated sources, each pre-sorted by MERGE_ORDER (best/newest first).
+# Paths are relative to the zen-feeds root. `.jsonl` sources are read line
+# by line, `.json` sources must hold a top-level array.
+CURATED_SOURCES = [
+    "../zen-wallpapers/s-grade-curated.json",
+]
+
+# Key the sources are sorted by: "score" or "date"
+MERGE_ORDER = "score"
+
+# Dates appear as "2026-02-09", "Feb 9, 2026" or "Feb 2026"
+DATE_FORMATS = ("%Y-%m-%d", "%b %d, %Y", "%b %Y")
+
+
+def parse_date(value):
+    """Date string -> datetime for ordering; unparseable dates sort oldest."""
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value or '', fmt)
+        except ValueError:
+            continue
+    return datetime.min
+
+
+SORT_KEYS = {
+    "score": lambda item: item.get('score', 85),
+    "date": lambda item: parse_date(item.get('date')),
+}
+
+CHUNK_SIZE = 64 * 1024
+
+# Computed image-quality scores (scripts/quality.py), used for items that
+# curation did not score
+QUALITY_PATH = "quality.json"
+
+_WHITESPACE = re.compile(r'\s*')
+_COLON = re.compile(r'\s*:\s*')
+
+
+def _decode_item(decoder, buf, pos):
+    return decoder.raw_decode(buf, pos)
+
+
+def _decode_member(decoder, buf, pos):
+    key, end = decoder.raw_decode(buf, pos)
+    colon = _COLON.match(buf, end)
+    if not isinstance(key, str) or not colon or colon.end() == len(buf):
+        raise json.JSONDecodeError("need more data", buf, end)
+    value, end = decoder.raw_decode(buf, colon.end())
+    return (key, value), end
+
+
+def _iter_container(path, kind, brackets, decode, chunk_size):
+    """Yield decode()d entries of a top-level JSON container, reading chunk by chunk.
+
+    decode(decoder, buf, pos) returns (entry, end) or raises JSONDecodeError
+    when the entry does not fit in the buffer yet. Separators are checked as
+    strictly as json.load does: exactly one comma between entries, none
+    before the first or after the last, and only whitespace after the
+    closing bracket.
+    """
+    opening, closing = brackets
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buf = ''
+        while not buf:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            buf = chunk.lstrip()
+        if not buf.startswith(opening):
+            raise ValueError(f"{path}: expected a JSON {kind}")
+        pos = 1
+        # What may come next: "first" entry or closing bracket, an "entry"
+        # after a comma, or a "separator" (comma or closing bracket)
+        expect = "first"
+        while True:
+            pos = _WHITESPACE.match(buf, pos).end()
+            try:
+                if pos == len(buf):
+                    raise json.JSONDecodeError("need more data", buf, pos)
+                if expect == "separator":
+                    if buf[pos] == ',':
+                        pos += 1
+                        expect = "entry"
+                        continue
+                    if buf[pos] != closing:
+                        raise ValueError(f"{path}: expected ',' or '{closing}' between {kind} entries")
+                    break
+                if buf[pos] == closing and expect == "first":
+                    break
+                if buf[pos] in (',', closing):
+                    raise ValueError(f"{path}: unexpected '{buf[pos]}' in JSON {kind}")
+                entry, end = decode(decoder, buf, pos)
+                # A number cut at the chunk boundary would decode short
+                if end == len(buf):
+                    raise json.JSONDecodeError("need more data", buf, end)
+            except json.JSONDecodeError:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    raise ValueError(f"{path}: truncated or malformed JSON {kind}")
+                # Keep only the unparsed tail so the buffer stays chunk-sized
+                buf = buf[pos:] + chunk
+                pos = 0
+                continue
+            pos = end
+            expect = "separator"
+            yield entry
+
+        rest = buf[pos + 1:]
+        while True:
+            if rest.strip():
+                raise ValueError(f"{path}: unexpected data after the JSON {kind}")
+            rest = f.read(chunk_size)
+            if not rest:
+                return
+
+
+def iter_json_array(path, chunk_size=CHUNK_SIZE):
+    """Yield the items of a top-level JSON array without loading the whole file."""
+    return _iter_container(path, "array", "[]", _decode_item, chunk_size)
+
+
+def iter_json_object(path, chunk_size=CHUNK_SIZE):
+    """Yield the (key, value) pairs of a top-level JSON object without loading the whole file.
+
+    Duplicate keys are yielded as they occur (json.load would keep the last).
+    """
+    return _iter_container(path, "object", "{}", _decode_member, chunk_size)
+
+
+def iter_jsonl(path):
+    """Yield one item per non-empty line of a JSON Lines file."""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def iter_source(path):
+    """Stream a single curated source."""
+    if path.endswith('.jsonl'):
+        return iter_jsonl(path)
+    return iter_json_array(path)
+
+
+def computed_scores(path=QUALITY_PATH):
+    """URL -> computed quality score, from quality.json if present."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        cache = json.load(f)
+    objects = cache.get("objects", {})
+    return {url: objects[sha]['score'] for url, sha in cache.get("urls", {}).items() if sha in objects}
+
+
+def with_computed_score(item, scores):
+    """Fill in the computed score of an item curation left unscored."""
+    if 'score' not in item and item.get('url') in scores:
+        item['score'] = scores[item['url']]
+    return item
+
+
+def iter_curated(paths=None, order=None, scores=None):
+    """K-way merge the curated sources, yielding each ID once.
+
+    Sources must already be sorted by `order` (descending). The first
+    occurrence of an ID in merge order wins, so an item listed by several
+    pipelines keeps its best score (or newest date). Only one item per
+    source plus the set of seen IDs is held in memory.
+
+    Items without a score get their computed one from `scores` (URL ->
+    score, default: quality.json). This happens after merging, so the
+    sources' own order is what the merge relies on.
+    """
+    paths = CURATED_SOURCES if paths is None else paths
+    key = SORT_KEYS[order or MERGE_ORDER]
+    scores = computed_scores() if scores is None else scores
+
+    seen = set()
+    merged = heapq.merge(*(iter_source(p) for p in paths), key=key, reverse=True)
+    for item in merged:
+        if item['id'] in seen:
+            continue
+        seen.add(item['id'])
+        yield with_computed_score(item, scores)
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    os.chdir(os.path.dirname(script_dir))  # Go to zen-feeds root
+
+    total = 0
+    for total, _ in enumerate(iter_curated(), 1):
+        pass
+    print(f"{total} unique curated images across {len(CURATED_SOURCES)} source(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+#!/usr/bin/env python3
+"""Exit statuses shared by the build (scripts/build.py) and its stages."""
+
+# The stage did what it could this run but has work left (a backlog, failures
+# worth retrying): the build still runs later stages, but does not record the
+# stage as up to date, so the next build runs it again. EX_TEMPFAIL.
+EXIT_INCOMPLETE = 75
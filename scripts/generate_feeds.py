@@ -1,11 +1,37 @@
 import json
-import subprocess
 import os
+import sys
+import threading
+
+from exit_codes import EXIT_INCOMPLETE
+from generation_backends import get_backend
+from rate_control import RateController
+from tagger import TAGGER
 
 CACHE_FILE = 'feeds.json'
 SOURCE_FILE = '../zen-wallpapers/s-grade-curated.json'
 
-def get_gemini_content(reason, author):
+# Selected by ZEN_GENERATION_BACKEND: the gemini CLI or the HTTP API.
+# Created on first use, so importing this module never reads the environment.
+_backend = None
+_backend_lock = threading.Lock()
+
+def backend():
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = get_backend()
+        return _backend
+
+def run_gemini(prompt):
+    """Generate through the configured backend and return its parsed JSON reply.
+    
+    Returns None for unusable output. Raises RateLimited, BackendTimeout or
+    BackendError when the call itself failed, so callers can back off.
+    """
+    return backend().generate(prompt)
+
+def get_gemini_content(reason, author, language="English"):
     prompt = f"""
     Create a zen-inspired blog article for a high-quality image.
     Image details: {reason} by {author}.
@@ -13,25 +39,43 @@ def get_gemini_content(reason, author):
     Output in JSON format with exactly these keys:
     - title: A short, poetic title (max 60 chars)
     - summary: A calming summary/teaser (max 150 chars)
-    - article: A short, mindful essay (3-4 paragraphs) exploring the theme of the image (Zen, Nature, or Culinary beauty).
+    - article: An object with these keys:
+      - headline: The essay's heading (max 60 chars)
+      - content: A short, mindful essay (3-4 paragraphs separated by blank lines) exploring the theme of the image (Zen, Nature, or Culinary beauty).
+      - tips: A list of 3 short mindful practices inspired by the image
     
-    Language: English.
+    Language: {language}.
     Return ONLY valid JSON.
     """
-    try:
-        result = subprocess.run(['gemini', prompt], capture_output=True, text=True)
-        if result.returncode == 0:
-            # Try to parse JSON from output
-            content = result.stdout.strip()
-            # Clean up potential markdown code blocks
-            if content.startswith('```json'):
-                content = content[7:-3].strip()
-            elif content.startswith('```'):
-                content = content[3:-3].strip()
-            return json.loads(content)
-    except Exception as e:
-        print(f"Error calling gemini: {e}")
-    return None
+    content = run_gemini(prompt)
+    if content is not None and not is_article_reply(content):
+        print(f"Unusable reply for {reason!r}: needs title, summary and article")
+        return None
+    return content
+
+def is_article_reply(content):
+    """True if a reply has the title, summary and article a feed entry needs."""
+    article = content.get('article')
+    if isinstance(article, dict):
+        article = article.get('content')
+    texts = [content.get('title'), content.get('summary'), article]
+    return all(isinstance(text, str) and text.strip() for text in texts)
+
+def article_record(content):
+    """The feed's article shape ({headline, content, tips}) from a model reply.
+
+    Replies that give the article as plain text get the title as headline
+    and no tips.
+    """
+    article = content['article']
+    if isinstance(article, dict):
+        tips = article.get('tips')
+        return {
+            "headline": article.get('headline') or content['title'],
+            "content": article.get('content', ''),
+            "tips": [tip for tip in tips if isinstance(tip, str)] if isinstance(tips, list) else [],
+        }
+    return {"headline": content['title'], "content": article, "tips": []}
 
 def main():
     if not os.path.exists(SOURCE_FILE):
@@ -50,15 +94,24 @@ def main():
 
     # Process latest 15 wallpapers
     latest = wallpapers[:15]
+    pending = [wp for wp in latest if wp['id'] not in feeds]
     updated = False
 
-    for wp in latest:
+    def generate(wp):
+        print(f"Generating content for {wp['id']}...")
+        return get_gemini_content(wp['reason'], wp['author'])
+
+    results = {}
+    errors = {}
+    for wp, content, error in RateController.for_build().map(generate, pending):
+        results[wp['id']] = content
+        errors[wp['id']] = error
+
+    # Insert in curated order, whatever order the calls finished in
+    failed = 0
+    for wp in pending:
         wp_id = wp['id']
-        if wp_id in feeds:
-            continue
-        
-        print(f"Generating content for {wp_id}...")
-        content = get_gemini_content(wp['reason'], wp['author'])
+        content = results.get(wp_id)
         if content:
             feeds[wp_id] = {
                 "id": wp_id,
@@ -66,12 +119,19 @@ def main():
                 "author": wp['author'],
                 "title": content['title'],
                 "summary": content['summary'],
-                "article": content['article'],
-                "date": wp.get('date', 'Feb 9, 2026')
+                "score": wp.get('score', 85),
+                "date": wp.get('date', 'Feb 9, 2026'),
+                # Same record shape as sync_new_curated.build_entries()
+                "category": TAGGER.primary(wp.get('reason', '')),
+                "article": article_record(content)
             }
             updated = True
+        elif errors.get(wp_id):
+            print(f"Failed to generate for {wp_id}: {errors[wp_id]}")
+            failed += 1
         else:
             print(f"Failed to generate for {wp_id}")
+            failed += 1
 
     if updated:
         with open(CACHE_FILE, 'w') as f:
@@ -79,6 +139,9 @@ def main():
         print("Feeds updated.")
     else:
         print("No new feeds generated.")
+    if failed:
+        # Retried on the next build
+        sys.exit(EXIT_INCOMPLETE)
 
 if __name__ == "__main__":
     main()
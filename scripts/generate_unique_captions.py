@@ -1,7 +1,16 @@
 #!/usr/bin/env python3
-"""Generate unique zen captions for all images in feeds.json"""
+"""Generate unique zen captions for images in feeds.json
 
+Usage:
+    python scripts/generate_unique_captions.py
+        recaption every entry (a full reshuffle)
+    python scripts/generate_unique_captions.py --changeset changeset.json
+        caption only the entries the last sync added; other captions are kept
+"""
+
+import argparse
 import json
+import os
 import random
 
 # Large pool of unique zen titles (100+)
@@ -669,6 +678,43 @@ ZEN_SUMMARIES = [
     "Your breath arrives without being called."
 ]
 
+# Suffixes for numbered title variants once the base pool runs out
+TITLE_SUFFIXES = ["II", "III", "IV", "V", "Revisited", "Renewed", "Reflected", "Remembered"]
+
+def assign_unique_captions(entries, used_titles):
+    """Caption new entries without reshuffling existing ones.
+    
+    Titles already in used_titles are skipped; used_titles is updated in place.
+    The result depends only on the entries and used_titles, so captioning
+    the same entries again gives the same captions.
+    """
+    base = random.Random(42).sample(ZEN_TITLES, len(ZEN_TITLES))
+    candidates = (f"{t} {s}" if s else t for s in [""] + TITLE_SUFFIXES for t in base)
+    for entry in entries:
+        for title in candidates:
+            if title not in used_titles:
+                break
+        else:
+            n = len(used_titles) + 1
+            while f"{base[n % len(base)]} {n}" in used_titles:
+                n += 1
+            title = f"{base[n % len(base)]} {n}"
+        used_titles.add(title)
+        entry['title'] = title
+        entry['summary'] = random.Random(entry['id']).choice(ZEN_SUMMARIES)
+
+
+def caption_added(feeds, added):
+    """Caption the entries listed in a sync changeset; returns how many changed."""
+    added = [feed_id for feed_id in dict.fromkeys(added) if feed_id in feeds]
+    skip = set(added)
+    used_titles = {e.get('title') for feed_id, e in feeds.items() if feed_id not in skip}
+    before = [(feeds[f].get('title'), feeds[f].get('summary')) for f in added]
+    assign_unique_captions([feeds[f] for f in added], used_titles)
+    after = [(feeds[f]['title'], feeds[f]['summary']) for f in added]
+    return sum(b != a for b, a in zip(before, after))
+
+
 def generate_unique_feeds():
     # Load existing feeds
     with open('feeds.json', 'r') as f:
@@ -685,15 +731,15 @@ def generate_unique_feeds():
     print(f"Available summaries: {len(summaries)}")
     
     # Extend titles if needed by adding numbered variants
+    random.seed(42)  # For reproducibility
     while len(titles) < total_images:
         base = random.choice(ZEN_TITLES)
-        suffix = ["II", "III", "IV", "V", "Revisited", "Renewed", "Reflected", "Remembered"][len(titles) % 8]
+        suffix = TITLE_SUFFIXES[len(titles) % len(TITLE_SUFFIXES)]
         new_title = f"{base} {suffix}"
         if new_title not in titles:
             titles.append(new_title)
     
     # Shuffle both lists
-    random.seed(42)  # For reproducibility
     random.shuffle(titles)
     random.shuffle(summaries)
     
@@ -736,5 +782,27 @@ def generate_unique_feeds():
     else:
         print("✓ All summaries are unique!")
 
+def main():
+    parser = argparse.ArgumentParser(description="Generate unique zen captions for feeds.json")
+    parser.add_argument("--changeset", help="caption only the entries added in this changeset")
+    args = parser.parse_args()
+
+    if not args.changeset:
+        generate_unique_feeds()
+        return
+
+    with open(args.changeset, 'r') as f:
+        added = json.load(f).get("added", [])
+    with open('feeds.json', 'r') as f:
+        feeds = json.load(f)
+
+    changed = caption_added(feeds, added)
+    if changed:
+        tmp = 'feeds.json.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(feeds, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, 'feeds.json')
+    print(f"Captioned {changed} of {len(added)} added entries")
+
 if __name__ == "__main__":
-    generate_unique_feeds()
+    main()
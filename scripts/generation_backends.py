@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""Pluggable backends for content generation.
+
+A backend turns a prompt into the parsed JSON object the model returned.
+It returns None when the reply is unusable, and raises the rate_control
+errors (RateLimited, BackendTimeout, BackendError) when the call itself
+failed, so RateController can back off.
+
+- CLIBackend shells out to the `gemini` CLI (one process per call).
+- HTTPBackend calls the Gemini REST API over pooled keep-alive connections,
+  optionally streaming the reply (server-sent events).
+
+The backend is chosen from the environment:
+    ZEN_GENERATION_BACKEND   "cli" (default) or "http"
+    GEMINI_API_URL           base URL, e.g. http://127.0.0.1:8765 for the stub
+    GEMINI_API_KEY           API key (sent as x-goog-api-key)
+    GEMINI_MODEL             model name
+    GEMINI_STREAM            "1" to use streamGenerateContent
+"""
+import http.client
+import json
+import os
+import socket
+import subprocess
+from abc import ABC, abstractmethod
+from urllib.parse import urlsplit
+
+from http_pool import STALE, ConnectionPool
+from rate_control import BackendError, BackendTimeout, RateLimited
+
+TIMEOUT = 120
+DEFAULT_API_URL = "https://generativelanguage.googleapis.com"
+DEFAULT_MODEL = "gemini-2.0-flash"
+
+# Substrings of CLI errors that mean we are over quota
+RATE_LIMIT_MARKERS = ('429', 'resource_exhausted', 'quota', 'rate limit')
+
+def parse_json_reply(content):
+    """Parse a model reply, tolerating markdown code fences.
+
+    None if it is not valid JSON or not an object.
+    """
+    content = content.strip()
+    # Clean up potential markdown code blocks
+    if content.startswith('```json'):
+        content = content[7:-3].strip()
+    elif content.startswith('```'):
+        content = content[3:-3].strip()
+    try:
+        reply = json.loads(content)
+    except ValueError as e:
+        print(f"Invalid JSON from model: {e}")
+        return None
+    if not isinstance(reply, dict):
+        print(f"Expected a JSON object from model, got {type(reply).__name__}")
+        return None
+    return reply
+
+
+class GenerationBackend(ABC):
+    """Interface: generate(prompt) -> parsed JSON object or None."""
+
+    @abstractmethod
+    def generate(self, prompt):
+        """Parsed JSON reply, or None; raises BackendError subclasses on failure."""
+
+    def close(self):
+        pass
+
+
+class CLIBackend(GenerationBackend):
+    """The `gemini` command line tool, one subprocess per call."""
+
+    def __init__(self, command='gemini', timeout=TIMEOUT):
+        self.command = command
+        self.timeout = timeout
+
+    def generate(self, prompt):
+        try:
+            result = subprocess.run([self.command, prompt], capture_output=True, text=True,
+                                    timeout=self.timeout)
+        except subprocess.TimeoutExpired:
+            raise BackendTimeout(f"{self.command} timed out after {self.timeout}s")
+        except OSError as e:
+            # Missing or unrunnable command
+            raise BackendError(f"{self.command}: {e}")
+        if result.returncode != 0:
+            error = (result.stderr or result.stdout).strip()[:200]
+            if any(marker in error.lower() for marker in RATE_LIMIT_MARKERS):
+                raise RateLimited(error)
+            raise BackendError(error or f"{self.command} exited with code {result.returncode}")
+        return parse_json_reply(result.stdout)
+
+
+class HTTPBackend(GenerationBackend):
+    """Gemini REST API (generateContent / streamGenerateContent)."""
+
+    def __init__(self, api_url=DEFAULT_API_URL, api_key=None, model=DEFAULT_MODEL,
+                 stream=False, timeout=TIMEOUT, pool=None):
+        parts = urlsplit(api_url)
+        self.scheme = parts.scheme
+        self.netloc = parts.netloc
+        self.prefix = parts.path.rstrip('/')
+        self.api_key = api_key
+        self.model = model
+        self.stream = stream
+        self.pool = pool or ConnectionPool(timeout=timeout)
+
+    def _path(self):
+        if self.stream:
+            return f"{self.prefix}/v1beta/models/{self.model}:streamGenerateContent?alt=sse"
+        return f"{self.prefix}/v1beta/models/{self.model}:generateContent"
+
+    def generate(self, prompt):
+        body = json.dumps({
+            "contents": [{"parts": [{"text": prompt}]}],
+            "generationConfig": {"responseMimeType": "application/json"},
+        }).encode('utf-8')
+        headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            headers["x-goog-api-key"] = self.api_key
+
+        for attempt in (0, 1):
+            conn = self.pool.acquire(self.scheme, self.netloc, fresh=attempt > 0)
+            try:
+                conn.request("POST", self._path(), body=body, headers=headers)
+                resp = conn.getresponse()
+                text = self._read(resp)
+            except STALE:
+                # Idle keep-alive connection was closed by the server; retry once fresh
+                self.pool.release(self.scheme, self.netloc, conn, reuse=False)
+                if attempt:
+                    raise BackendError("connection closed by server")
+                continue
+            except socket.timeout:
+                self.pool.release(self.scheme, self.netloc, conn, reuse=False)
+                raise BackendTimeout(f"no reply from {self.netloc} within {conn.timeout}s")
+            except (OSError, http.client.HTTPException) as e:
+                self.pool.release(self.scheme, self.netloc, conn, reuse=False)
+                raise BackendError(f"{self.netloc}: {e}")
+            self.pool.release(self.scheme, self.netloc, conn, reuse=not resp.will_close)
+            break
+
+        if resp.status == 429:
+            raise RateLimited(f"HTTP 429: {text[:200]}")
+        if resp.status in (408, 504):
+            raise BackendTimeout(f"HTTP {resp.status}")
+        if resp.status != 200:
+            raise BackendError(f"HTTP {resp.status}: {text[:200]}")
+        return parse_json_reply(text) if text is not None else None
+
+    def _read(self, resp):
+        """Return the model's text (joined across stream chunks), or the error body."""
+        if resp.status != 200:
+            return resp.read().decode('utf-8', 'replace')
+        if not self.stream:
+            return _candidate_text(resp.read())
+        chunks = []
+        for line in resp:
+            line = line.strip()
+            if line.startswith(b"data:"):
+                text = _candidate_text(line[5:])
+                if text is None:
+                    resp.read()  # drain so the connection can be reused
+                    return None
+                chunks.append(text)
+        return ''.join(chunks)
+
+    def close(self):
+        self.pool.close()
+
+
+def _candidate_text(payload):
+    """Text of the first candidate in a (chunk of a) generateContent reply."""
+    try:
+        data = json.loads(payload)
+        parts = data["candidates"][0]["content"]["parts"]
+        return ''.join(part.get("text", '') for part in parts)
+    except (ValueError, KeyError, IndexError, TypeError):
+        print("Malformed response envelope from model API")
+        return None
+
+
+def get_backend():
+    """Backend selected by ZEN_GENERATION_BACKEND (see module docstring)."""
+    kind = os.environ.get("ZEN_GENERATION_BACKEND", "cli")
+    if kind == "cli":
+        return CLIBackend()
+    if kind == "http":
+        return HTTPBackend(
+            api_url=os.environ.get("GEMINI_API_URL", DEFAULT_API_URL),
+            api_key=os.environ.get("GEMINI_API_KEY"),
+            model=os.environ.get("GEMINI_MODEL", DEFAULT_MODEL),
+            stream=os.environ.get("GEMINI_STREAM") == "1",
+        )
+    raise ValueError(f"unknown ZEN_GENERATION_BACKEND: {kind}")
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Keep-alive HTTP(S) connection pool, shared by the mirror and the HTTP backend."""
+import http.client
+import queue
+import threading
+
+CONNECTIONS_PER_HOST = 4
+TIMEOUT = 30
+
+# Errors that mean a pooled keep-alive connection went stale
+STALE = (http.client.RemoteDisconnected, http.client.CannotSendRequest,
+         BrokenPipeError, ConnectionResetError)
+
+
+class ConnectionPool:
+    """Keep-alive HTTP(S) connections, at most `per_host` per origin."""
+
+    def __init__(self, per_host=CONNECTIONS_PER_HOST, timeout=TIMEOUT):
+        self.per_host = per_host
+        self.timeout = timeout
+        self._idle = {}
+        self._slots = {}
+        self._lock = threading.Lock()
+
+    def _origin(self, scheme, netloc):
+        with self._lock:
+            if (scheme, netloc) not in self._idle:
+                self._idle[scheme, netloc] = queue.LifoQueue()
+                self._slots[scheme, netloc] = threading.BoundedSemaphore(self.per_host)
+            return self._idle[scheme, netloc], self._slots[scheme, netloc]
+
+    def acquire(self, scheme, netloc, fresh=False):
+        """Take a connection slot for the origin, reusing an idle connection."""
+        idle, slots = self._origin(scheme, netloc)
+        slots.acquire()
+        conn = None
+        if not fresh:
+            try:
+                conn = idle.get_nowait()
+            except queue.Empty:
+                pass
+        if conn is None:
+            cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            conn = cls(netloc, timeout=self.timeout)
+        return conn
+
+    def release(self, scheme, netloc, conn, reuse=True):
+        """Return a connection whose response was fully read (or close it)."""
+        idle, slots = self._origin(scheme, netloc)
+        if reuse:
+            idle.put(conn)
+        else:
+            conn.close()
+        slots.release()
+
+    def close(self):
+        with self._lock:
+            for idle in self._idle.values():
+                while not idle.empty():
+                    idle.get_nowait().close()
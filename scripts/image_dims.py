@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""Record image dimensions in feeds.json without decoding the images.
+
+Width and height are read from the file header only: the PNG IHDR chunk,
+the WebP VP8/VP8L/VP8X chunk, or the first JPEG start-of-frame marker
+(swapped when the EXIF orientation rotates the image, as browsers do).
+Probes read the first HEAD_BYTES of each image, growing the read only for
+JPEGs with large metadata, from the local mirror when it has a copy and
+with a ranged GET otherwise. Probes run on a thread pool and results are
+cached per URL and per mirrored content hash in image_dims.json.
+
+The client uses width/height to reserve each card's box before the image
+arrives, so the grid does not shift while loading.
+
+A failed probe leaves the entry's existing width/height alone and is
+recorded in image_dims.json with its attempt count, so it is not retried on
+every run:
+- transient failures (network errors, timeouts, 5xx, 408, 429) back off
+  exponentially from RETRY_BASE to RETRY_MAX; while any are outstanding
+  the script exits with EXIT_INCOMPLETE so the build keeps coming back;
+- permanent failures (other HTTP errors, unreadable headers) are retried
+  only after PERMANENT_RETRY and do not hold the stage open.
+
+Usage:
+    python scripts/image_dims.py              (adds width/height to feeds.json)
+    python scripts/image_dims.py FILE ...     (prints the size of local files)
+"""
+import http.client
+import json
+import os
+import struct
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from exit_codes import EXIT_INCOMPLETE
+from mirror import HTTPStatusError, Mirror
+
+FEEDS_PATH = "feeds.json"
+CACHE_PATH = "image_dims.json"
+WORKERS = 16
+
+# Seconds until a failed probe is tried again
+RETRY_BASE = 3600
+RETRY_MAX = 7 * 24 * 3600
+PERMANENT_RETRY = 30 * 24 * 3600
+TRANSIENT_STATUS = {408, 429}
+
+HEAD_BYTES = 16 * 1024
+MAX_HEAD_BYTES = 1024 * 1024
+
+# JPEG start-of-frame markers (C4, C8 and CC are DHT, JPG and DAC)
+_SOF = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+# Markers without a length field
+_STANDALONE = {0x01, 0xD8} | set(range(0xD0, 0xD8))
+
+
+def _exif_orientation(segment):
+    """Orientation tag (1-8) from an APP1 Exif payload, or 1."""
+    tiff = segment[6:]
+    endian = {b'II': '<', b'MM': '>'}.get(tiff[:2])
+    if not endian:
+        return 1
+    try:
+        ifd = struct.unpack_from(endian + 'I', tiff, 4)[0]
+        count = struct.unpack_from(endian + 'H', tiff, ifd)[0]
+        for i in range(count):
+            tag, _, _, value = struct.unpack_from(endian + 'HHIH', tiff, ifd + 2 + 12 * i)
+            if tag == 0x0112:
+                return value
+    except struct.error:
+        pass
+    return 1
+
+
+def _jpeg_size(data):
+    orientation = 1
+    i = 2
+    while i + 4 <= len(data):
+        if data[i] != 0xFF:
+            return None  # lost sync: not a JPEG we can read
+        marker = data[i + 1]
+        if marker == 0xFF:  # fill byte
+            i += 1
+            continue
+        if marker in _STANDALONE:
+            i += 2
+            continue
+        length = struct.unpack_from('>H', data, i + 2)[0]
+        if marker in _SOF:
+            if i + 9 > len(data):
+                return None
+            height, width = struct.unpack_from('>HH', data, i + 5)
+            return (height, width) if orientation >= 5 else (width, height)
+        if marker == 0xE1 and data[i + 4:i + 10] == b'Exif\0\0':
+            if i + 2 + length > len(data):
+                return None
+            orientation = _exif_orientation(data[i + 4:i + 2 + length])
+        if marker == 0xDA:  # start of scan before any frame header
+            return None
+        i += 2 + length
+    return None
+
+
+def _webp_size(data):
+    chunk = data[12:16]
+    if chunk == b'VP8 ' and len(data) >= 30 and data[23:26] == b'\x9d\x01\x2a':
+        width, height = struct.unpack_from('<HH', data, 26)
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b'VP8L' and len(data) >= 25 and data[20] == 0x2F:
+        bits = struct.unpack_from('<I', data, 21)[0]
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b'VP8X' and len(data) >= 30:
+        width = int.from_bytes(data[24:27], 'little') + 1
+        height = int.from_bytes(data[27:30], 'little') + 1
+        return width, height
+    return None
+
+
+def probe(data):
+    """(width, height) from the head of a JPEG, PNG, WebP or GIF file, or None.
+
+    None means the format is unknown or the header lies beyond `data`.
+    """
+    if data[:8] == b'\x89PNG\r\n\x1a\n' and len(data) >= 24 and data[12:16] == b'IHDR':
+        return struct.unpack_from('>II', data, 16)
+    if data[:2] == b'\xff\xd8':
+        return _jpeg_size(data)
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        return _webp_size(data)
+    if data[:6] in (b'GIF87a', b'GIF89a') and len(data) >= 10:
+        return struct.unpack_from('<HH', data, 6)
+    return None
+
+
+def probe_file(path):
+    """Dimensions of a local image, reading only as much of it as needed."""
+    size = HEAD_BYTES
+    with open(path, 'rb') as f:
+        data = f.read(size)
+        while True:
+            dims = probe(data)
+            if dims or len(data) < size or size >= MAX_HEAD_BYTES:
+                return dims
+            data += f.read(size * 7)
+            size *= 8
+
+
+def probe_url(mirror, url, known):
+    """Dimensions of a feed image via the mirror; returns (dims, sha).
+
+    `known` maps content hashes to already probed dimensions.
+    """
+    size = HEAD_BYTES
+    while True:
+        data, sha = mirror.read_head(url, size)
+        if sha in known:
+            return known[sha], sha
+        dims = probe(data)
+        if dims or len(data) < size or size >= MAX_HEAD_BYTES:
+            return dims, sha
+        size *= 8
+
+
+def load_cache():
+    if os.path.exists(CACHE_PATH):
+        with open(CACHE_PATH, 'r') as f:
+            return json.load(f)
+    return {"urls": {}, "objects": {}, "failed": {}}
+
+
+def record_failure(failures, url, error, transient, now):
+    """Note a failed probe and when to try it again."""
+    attempts = failures.get(url, {}).get('attempts', 0) + 1
+    if transient:
+        delay = min(RETRY_MAX, RETRY_BASE * 2 ** (attempts - 1))
+    else:
+        delay = PERMANENT_RETRY
+    failures[url] = {"attempts": attempts, "error": error, "transient": transient,
+                     "retry_at": now + delay}
+
+
+def update_dims(feeds, cache, mirror, workers=WORKERS, now=None):
+    """Probe uncached feed images and set width/height on every entry.
+
+    Entries whose image could not be probed keep the dimensions they have;
+    failures wait out their backoff before being probed again.
+    Returns (probed, failed, transient failures outstanding, changed entries).
+    """
+    now = time.time() if now is None else now
+    feed_urls = list(dict.fromkeys(e['url'] for e in feeds.values() if e.get('url')))
+    failures = cache.setdefault("failed", {})
+    for url in set(failures) - set(feed_urls):
+        del failures[url]
+    urls = [u for u in feed_urls
+            if u not in cache["urls"] and failures.get(u, {}).get('retry_at', 0) <= now]
+
+    def run(url):
+        try:
+            dims, sha = probe_url(mirror, url, cache["objects"])
+        except HTTPStatusError as e:
+            transient = e.status in TRANSIENT_STATUS or e.status >= 500
+            return url, None, None, str(e), transient
+        except (OSError, http.client.HTTPException) as e:
+            return url, None, None, str(e) or type(e).__name__, True
+        if not dims:
+            return url, None, sha, "unreadable image header", False
+        return url, dims, sha, None, False
+
+    failed = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for url, dims, sha, error, transient in pool.map(run, urls):
+            if not dims:
+                print(f"Failed {url}: {error}")
+                record_failure(failures, url, error, transient, now)
+                failed += 1
+                continue
+            failures.pop(url, None)
+            cache["urls"][url] = list(dims)
+            if sha:
+                cache["objects"][sha] = list(dims)
+    pending = sum(1 for f in failures.values() if f['transient'])
+
+    changed = 0
+    for entry in feeds.values():
+        dims = cache["urls"].get(entry.get('url'))
+        current = [entry.get('width'), entry.get('height')]
+        if dims and current != dims:
+            entry['width'], entry['height'] = dims
+            changed += 1
+    return len(urls) - failed, failed, pending, changed
+
+
+def main():
+    if len(sys.argv) > 1:
+        for path in sys.argv[1:]:
+            dims = probe_file(path)
+            print(f"{path}: {'x'.join(map(str, dims)) if dims else 'unknown'}")
+        return
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    os.chdir(os.path.dirname(script_dir))  # Go to zen-feeds root
+
+    with open(FEEDS_PATH, 'r') as f:
+        feeds = json.load(f)
+    cache = load_cache()
+    mirror = Mirror()
+
+    start = time.time()
+    try:
+        probed, failed, pending, changed = update_dims(feeds, cache, mirror)
+    finally:
+        mirror.pool.close()
+    print(f"Probed {probed} images in {time.time() - start:.1f}s ({failed} failed, "
+          f"{pending} waiting to be retried)")
+
+    if probed or failed:
+        tmp = CACHE_PATH + ".tmp"
+        with open(tmp, 'w') as f:
+            json.dump(cache, f, separators=(',', ':'), sort_keys=True)
+        os.replace(tmp, CACHE_PATH)
+    if changed:
+        tmp = FEEDS_PATH + ".tmp"
+        with open(tmp, 'w') as f:
+            json.dump(feeds, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, FEEDS_PATH)
+        print(f"Updated dimensions on {changed} entries")
+    else:
+        print("All entries up to date")
+    if pending:
+        sys.exit(EXIT_INCOMPLETE)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""Generate per-locale variants of feeds.json.
+
+Each locale is an independent pass, run in parallel with the others and
+after (never inside) the English pipeline. Translations are cached per
+locale in locales/<locale>.json together with a hash of the English fields
+they came from; entries that are missing or whose English text changed are
+sent to Gemini, at most BATCH_SIZE per run like generate_feeds.py. While any
+are left the script exits with EXIT_INCOMPLETE so the build runs it again
+next time. Each pass publishes
+feeds.<locale>.json: the English records with translated title, summary and
+article overlaid, so a client downloads only its own language.
+
+Usage: python scripts/localize_feeds.py [locale ...]
+"""
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from exit_codes import EXIT_INCOMPLETE
+from generate_feeds import run_gemini
+from rate_control import RateController
+from validate_feeds import check_record
+
+FEEDS_PATH = "feeds.json"
+CACHE_DIR = "locales"
+
+# Enabled locales: code -> language name used in the prompt
+LOCALES = {
+    "ja": "Japanese",
+}
+
+BATCH_SIZE = 15
+LOCALIZED_FIELDS = ("title", "summary", "article")
+
+
+def cache_path(locale):
+    return os.path.join(CACHE_DIR, f"{locale}.json")
+
+
+def output_path(locale):
+    return f"feeds.{locale}.json"
+
+
+def source_fields(entry):
+    return {field: entry[field] for field in LOCALIZED_FIELDS if field in entry}
+
+
+def source_hash(entry):
+    """Hash of the English fields a translation was made from."""
+    data = json.dumps(source_fields(entry), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()[:16]
+
+
+def _overlay(cached):
+    """The translated fields of a cache entry."""
+    return {field: value for field, value in cached.items() if field != 'source'}
+
+
+def translation_errors(entry, translated):
+    """Violations the translated fields bring into the record, as (field, message).
+
+    Translations are held to the same rules as the English feed, so the
+    client never gets e.g. an article without content.
+    """
+    record = dict(entry, **translated)
+    return [(field, message) for field, message in check_record(entry['id'], record)
+            if field in translated]
+
+
+def translate_content(entry, language):
+    source = source_fields(entry)
+    prompt = f"""
+    Translate the values of this JSON object into {language}.
+    Keep the calm, zen-inspired tone. Keep the same keys and structure;
+    translate every string value, including nested ones.
+
+    {json.dumps(source, ensure_ascii=False)}
+
+    Return ONLY valid JSON.
+    """
+    content = run_gemini(prompt)
+    if not isinstance(content, dict) or not all(field in content for field in source):
+        return None
+    translated = {field: content[field] for field in source}
+    errors = translation_errors(entry, translated)
+    if errors:
+        print(f"Rejected translation of {entry['id']}: "
+              + ", ".join(f"{field} {message}" for field, message in errors))
+        return None
+    return translated
+
+
+def localize(locale, language, feeds, controller):
+    """One locale pass; returns (translated this run, missing afterwards)."""
+    path = cache_path(locale)
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            cache = json.load(f)
+    else:
+        cache = {}
+
+    # Only valid translations of the current English text count; stale ones are
+    # redone, and entries no longer in the feed are dropped
+    hashes = {feed_id: source_hash(entry) for feed_id, entry in feeds.items()}
+    current = {feed_id: cached for feed_id, cached in cache.items()
+               if cached.get('source') == hashes.get(feed_id)
+               and not translation_errors(feeds[feed_id], _overlay(cached))}
+    changed = len(current) != len(cache)
+    cache = current
+
+    # Newest entries first, matching generate_feeds.py's "latest" batch
+    missing = [feed_id for feed_id in reversed(list(feeds)) if feed_id not in cache]
+
+    def translate(feed_id):
+        print(f"[{locale}] Translating {feed_id}...")
+        return translate_content(feeds[feed_id], language)
+
+    translated = 0
+    for feed_id, content, error in controller.map(translate, missing[:BATCH_SIZE]):
+        if content:
+            cache[feed_id] = dict(content, source=hashes[feed_id])
+            translated += 1
+        else:
+            print(f"[{locale}] Failed to translate {feed_id}" + (f": {error}" if error else ""))
+
+    if translated or changed or not os.path.exists(path):
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(cache, f, indent=2, ensure_ascii=False)
+
+    localized = {}
+    for feed_id, entry in feeds.items():
+        localized[feed_id] = dict(entry, **_overlay(cache.get(feed_id, {})))
+    with open(output_path(locale), 'w') as f:
+        json.dump(localized, f, ensure_ascii=False, separators=(',', ':'))
+
+    return translated, len(missing) - translated
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    os.chdir(os.path.dirname(script_dir))  # Go to zen-feeds root
+
+    locales = sys.argv[1:] or list(LOCALES)
+    unknown = [loc for loc in locales if loc not in LOCALES]
+    if unknown:
+        print(f"Unknown locale(s): {', '.join(unknown)}")
+        sys.exit(1)
+
+    with open(FEEDS_PATH, 'r') as f:
+        feeds = json.load(f)
+
+    # One controller for all locales: they share the same backend quota
+    controller = RateController.for_build()
+    backlog = 0
+    with ThreadPoolExecutor(max_workers=len(locales) or 1) as pool:
+        results = pool.map(lambda loc: (loc, localize(loc, LOCALES[loc], feeds, controller)), locales)
+        for locale, (translated, remaining) in results:
+            print(f"{output_path(locale)}: {translated} translated, {remaining} still in English")
+            backlog += remaining
+    if backlog:
+        sys.exit(EXIT_INCOMPLETE)
+
+
+if __name__ == "__main__":
+    main()
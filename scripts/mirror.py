@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""Content-addressed local mirror of the feed images.
+
+- Fetches run on a thread pool over pooled keep-alive connections per host.
+- Bodies are stored once under mirror/objects/<sha256>, so the same photo
+  listed under several IDs or URLs takes disk space once.
+- A disk budget is enforced as objects are stored: a new object evicts
+  least-recently-used objects that this run has not touched, and is dropped
+  (and no further new URLs fetched) once everything left is in use. Cached
+  URLs are revalidated before new ones are fetched, so a full store keeps
+  what it has instead of cycling objects in and out on every run.
+- Known URLs are revalidated with If-None-Match / If-Modified-Since.
+
+Any http(s) URL works, so the mirror can be exercised offline against a
+local stand-in server, e.g. `python -m http.server` serving a directory of
+images and a feeds file whose URLs point at it (--feeds).
+
+Usage: python scripts/mirror.py [--feeds feeds.json] [--budget-mb 2048] [--workers 8]
+"""
+import argparse
+import hashlib
+import http.client
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlsplit
+
+from http_pool import STALE, ConnectionPool
+
+FEEDS_PATH = "feeds.json"
+MIRROR_DIR = "mirror"
+DISK_BUDGET = 2 * 1024 ** 3
+WORKERS = 8
+MAX_REDIRECTS = 5
+USER_AGENT = "zen-feeds-mirror/1.0"
+
+class HTTPStatusError(http.client.HTTPException):
+    """The server answered, but not with the content asked for."""
+
+    def __init__(self, status):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+
+
+class Mirror:
+    """URL -> content-addressed object store with LRU eviction."""
+
+    def __init__(self, root=MIRROR_DIR, budget=DISK_BUDGET, pool=None):
+        self.root = root
+        self.budget = budget
+        self.pool = pool or ConnectionPool()
+        self.index_path = os.path.join(root, "index.json")
+        self._lock = threading.Lock()
+        if os.path.exists(self.index_path):
+            with open(self.index_path, 'r') as f:
+                index = json.load(f)
+        else:
+            index = {}
+        # url -> {"sha", "etag", "last_modified"}; sha -> {"size", "used"}
+        self.urls = index.get("urls", {})
+        self.objects = index.get("objects", {})
+        self.total = sum(obj['size'] for obj in self.objects.values())
+        # Objects used before this moment may be evicted to make room
+        self.started = time.time()
+
+    def object_path(self, sha):
+        return os.path.join(self.root, "objects", sha[:2], sha[2:])
+
+    def path(self, url):
+        """Local path of a mirrored URL (marking it used), or None."""
+        with self._lock:
+            entry = self.urls.get(url)
+            if not entry or entry['sha'] not in self.objects:
+                return None
+            self.objects[entry['sha']]['used'] = time.time()
+            return self.object_path(entry['sha'])
+
+    def save(self):
+        os.makedirs(self.root, exist_ok=True)
+        tmp = self.index_path + ".tmp"
+        with self._lock:
+            with open(tmp, 'w') as f:
+                json.dump({"urls": self.urls, "objects": self.objects}, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.index_path)
+
+    def _request(self, url, headers):
+        """GET following redirects.
+
+        Returns (response, release) where release(reuse) hands the
+        connection back to the pool once the body has been consumed.
+        """
+        for _ in range(MAX_REDIRECTS + 1):
+            parts = urlsplit(url)
+            target = parts.path or "/"
+            if parts.query:
+                target += "?" + parts.query
+            for attempt in (0, 1):
+                conn = self.pool.acquire(parts.scheme, parts.netloc, fresh=attempt > 0)
+                try:
+                    conn.request("GET", target, headers=headers)
+                    resp = conn.getresponse()
+                    break
+                except STALE:
+                    # Idle keep-alive connection was closed by the server; retry once fresh
+                    self.pool.release(parts.scheme, parts.netloc, conn, reuse=False)
+                    if attempt:
+                        raise
+                except BaseException:
+                    self.pool.release(parts.scheme, parts.netloc, conn, reuse=False)
+                    raise
+
+            def release(reuse, parts=parts, conn=conn):
+                self.pool.release(parts.scheme, parts.netloc, conn, reuse=reuse)
+
+            location = resp.getheader("Location")
+            if resp.status in (301, 302, 303, 307, 308) and location:
+                resp.read()
+                release(not resp.will_close)
+                url = urljoin(url, location)
+                continue
+            return resp, release
+        raise http.client.HTTPException(f"too many redirects for {url}")
+
+    def is_cached(self, url):
+        with self._lock:
+            entry = self.urls.get(url)
+            return bool(entry) and entry['sha'] in self.objects
+
+    def _has_room(self):
+        # Caller holds the lock
+        return self.total < self.budget or any(
+            obj['used'] < self.started for obj in self.objects.values())
+
+    def fetch(self, url):
+        """Mirror one URL.
+
+        Returns "fresh", "fetched", "deduped", "over budget" or "failed".
+        """
+        headers = {"User-Agent": USER_AGENT}
+        with self._lock:
+            entry = self.urls.get(url)
+            cached = bool(entry) and entry['sha'] in self.objects
+            if not cached and not self._has_room():
+                return "over budget"
+        if cached:
+            if entry.get('etag'):
+                headers["If-None-Match"] = entry['etag']
+            if entry.get('last_modified'):
+                headers["If-Modified-Since"] = entry['last_modified']
+
+        try:
+            resp, release = self._request(url, headers)
+        except (OSError, http.client.HTTPException) as e:
+            print(f"Failed {url}: {e}")
+            return "failed"
+
+        try:
+            if resp.status == 304 and cached:
+                resp.read()
+                release(not resp.will_close)
+                with self._lock:
+                    self.objects[entry['sha']]['used'] = time.time()
+                return "fresh"
+            if resp.status != 200:
+                resp.read()
+                release(not resp.will_close)
+                print(f"Failed {url}: HTTP {resp.status}")
+                return "failed"
+            sha, outcome = self._store(resp)
+        except (OSError, http.client.HTTPException) as e:
+            release(False)
+            print(f"Failed {url}: {e}")
+            return "failed"
+        release(not resp.will_close)
+        if sha is None:
+            return outcome
+
+        with self._lock:
+            self.urls[url] = {
+                "sha": sha,
+                "etag": resp.getheader("ETag"),
+                "last_modified": resp.getheader("Last-Modified"),
+            }
+        return outcome
+
+    def read_head(self, url, size):
+        """First `size` bytes of an image: from the store if mirrored, else a ranged GET.
+
+        Returns (data, sha); sha is None for remote reads. Servers that
+        ignore Range are read only up to `size` and the connection dropped.
+        """
+        with self._lock:
+            entry = self.urls.get(url)
+            sha = entry['sha'] if entry and entry['sha'] in self.objects else None
+            if sha:
+                self.objects[sha]['used'] = time.time()
+        if sha:
+            with open(self.object_path(sha), 'rb') as f:
+                return f.read(size), sha
+
+        headers = {"User-Agent": USER_AGENT, "Range": f"bytes=0-{size - 1}"}
+        resp, release = self._request(url, headers)
+        try:
+            if resp.status not in (200, 206):
+                raise HTTPStatusError(resp.status)
+            data = resp.read(size)
+        except BaseException:
+            release(False)
+            raise
+        # A 200 reply may still have a body left; don't reuse that connection
+        release(resp.status == 206 and not resp.will_close and resp.read() == b'')
+        return data, None
+
+    def _admit(self, sha, size):
+        """Register an object, evicting LRU objects not used this run to fit it.
+
+        Returns the evicted shas, or None if it does not fit. Caller holds
+        the lock.
+        """
+        if sha in self.objects:
+            self.objects[sha]['used'] = time.time()
+            return []
+        if size > self.budget:
+            return None
+        evicted = []
+        freed = 0
+        candidates = sorted((s for s, obj in self.objects.items() if obj['used'] < self.started),
+                            key=lambda s: self.objects[s]['used'])
+        while self.total - freed + size > self.budget:
+            if len(evicted) == len(candidates):
+                return None
+            evicted.append(candidates[len(evicted)])
+            freed += self.objects[evicted[-1]]['size']
+        for s in evicted:
+            self.total -= self.objects.pop(s)['size']
+        if evicted:
+            gone = set(evicted)
+            self.urls = {u: e for u, e in self.urls.items() if e['sha'] not in gone}
+        self.objects[sha] = {"size": size, "used": time.time()}
+        self.total += size
+        return evicted
+
+    def _remove_objects(self, shas):
+        for sha in shas:
+            try:
+                os.remove(self.object_path(sha))
+            except FileNotFoundError:
+                pass
+
+    def _store(self, resp):
+        """Stream a response body into the object store, within the disk budget.
+
+        Returns (sha, "fetched" or "deduped"), or (None, "over budget") if
+        the body does not fit. Only the body being downloaded can take the
+        store past its budget, and only until it is admitted or dropped.
+        """
+        tmp_dir = os.path.join(self.root, "tmp")
+        os.makedirs(tmp_dir, exist_ok=True)
+        tmp = os.path.join(tmp_dir, f"{threading.get_ident()}-{time.monotonic_ns()}")
+        h = hashlib.sha256()
+        size = 0
+        try:
+            with open(tmp, 'wb') as f:
+                for block in iter(lambda: resp.read(64 * 1024), b''):
+                    h.update(block)
+                    f.write(block)
+                    size += len(block)
+            sha = h.hexdigest()
+            with self._lock:
+                deduped = sha in self.objects
+                evicted = self._admit(sha, size)
+            if evicted is None:
+                os.remove(tmp)
+                return None, "over budget"
+            self._remove_objects(evicted)
+            dest = self.object_path(sha)
+            if os.path.exists(dest):
+                os.remove(tmp)
+            else:
+                os.makedirs(os.path.dirname(dest), exist_ok=True)
+                os.replace(tmp, dest)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        return sha, "deduped" if deduped else "fetched"
+
+    def evict(self):
+        """Drop least-recently-used objects until the store fits the budget.
+
+        Stores keep within the budget themselves; this trims a store left
+        over budget by a lowered --budget-mb.
+        """
+        with self._lock:
+            evicted = []
+            for sha in sorted(self.objects, key=lambda s: self.objects[s]['used']):
+                if self.total <= self.budget:
+                    break
+                self.total -= self.objects.pop(sha)['size']
+                evicted.append(sha)
+            if evicted:
+                gone = set(evicted)
+                self.urls = {u: e for u, e in self.urls.items() if e['sha'] not in gone}
+        self._remove_objects(evicted)
+        return len(evicted), self.total
+
+    def fetch_all(self, urls, workers=WORKERS):
+        """Mirror URLs in parallel; returns a count per fetch() outcome.
+
+        Cached URLs go first, so they are marked in use before new ones
+        look for room.
+        """
+        urls = sorted(urls, key=lambda url: not self.is_cached(url))
+        counts = {}
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for outcome in pool.map(self.fetch, urls):
+                counts[outcome] = counts.get(outcome, 0) + 1
+        return counts
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    os.chdir(os.path.dirname(script_dir))  # Go to zen-feeds root
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--feeds", default=FEEDS_PATH, help="feed file whose image URLs to mirror")
+    parser.add_argument("--budget-mb", type=int, default=DISK_BUDGET // 1024 ** 2)
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    args = parser.parse_args()
+
+    with open(args.feeds, 'r') as f:
+        feeds = json.load(f)
+    urls = list(dict.fromkeys(entry['url'] for entry in feeds.values()))
+
+    mirror = Mirror(budget=args.budget_mb * 1024 ** 2)
+    start = time.time()
+    try:
+        counts = mirror.fetch_all(urls, workers=args.workers)
+    finally:
+        mirror.pool.close()
+        evicted, total = mirror.evict()  # only if --budget-mb was lowered
+        mirror.save()
+
+    summary = ", ".join(f"{n} {outcome}" for outcome, n in sorted(counts.items()))
+    print(f"Mirrored {len(urls)} URLs in {time.time() - start:.1f}s: {summary}")
+    print(f"Store: {len(mirror.objects)} objects, {total / 1024 ** 2:.1f} MB ({evicted} evicted)")
+
+
+if __name__ == "__main__":
+    main()
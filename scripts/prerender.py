@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Prerender the first page of the grid into index.html.
+
+The first `postsPerLoad` cards are written straight into #grid, their card
+fields are inlined as JSON for the client to hydrate from, and the top
+images get <link rel="preload"> hints while the rest stay lazy. First paint
+then no longer waits on fetching and parsing the full feeds.json.
+
+Usage: python scripts/prerender.py
+"""
+import html
+import json
+import os
+import re
+
+FEEDS_PATH = "feeds.json"
+INDEX_PATH = "index.html"
+
+# Images above the fold on a phone (2 columns x 3 rows) are preloaded
+PRELOAD_IMAGES = 6
+
+# Record fields inlined for hydration (articles wait for feeds.json)
+CARD_FIELDS = ("id", "url", "author", "title", "summary", "category", "width", "height")
+
+_POSTS_PER_LOAD = re.compile(r'let postsPerLoad = (\d+);')
+
+
+def _block(name):
+    return re.compile(r'(<!-- prerender:%s -->).*?(<!-- /prerender:%s -->)' % (name, name), re.S)
+
+
+def render_card(post, index, eager):
+    """Same markup as renderBatch() in index.html.
+
+    Cards above the fold get their image inline; the rest keep renderBatch()'s
+    lazy data-src so they don't compete with the preloaded images.
+    """
+    url = html.escape(post['url'])
+    size = f' width="{post["width"]}" height="{post["height"]}"' if post.get('width') else ''
+    if eager:
+        img = f'<img src="{url}"{size} fetchpriority="high" decoding="async" onerror="this.style.display=\'none\'">'
+    else:
+        img = f'<img data-src="{url}"{size} loading="lazy" onerror="this.style.display=\'none\'" class="lazy-img">'
+    return f'''
+                <div class="item" onclick="openModal({index}, event)" data-index="{index}">
+                    {img}
+                    <div class="item-info">
+                        <div class="item-author">{html.escape(post.get('author') or '')}</div>
+                        <div class="item-title">{html.escape(post.get('title') or '')}</div>
+                    </div>
+                </div>
+            '''
+
+
+def render_data(posts):
+    # Only what cards and the photo viewer show; init() swaps in full records
+    cards = [{k: p[k] for k in CARD_FIELDS if k in p} for p in posts]
+    # "</" would close the script element early
+    payload = json.dumps(cards, ensure_ascii=False, separators=(',', ':')).replace('</', '<\\/')
+    return f'<script type="application/json" id="critical-data">{payload}</script>'
+
+
+def render_preload(posts):
+    return ''.join(
+        f'\n    <link rel="preload" as="image" href="{html.escape(p["url"])}">'
+        for p in posts[:PRELOAD_IMAGES]
+    ) + '\n    '
+
+
+def prerender(page, feeds):
+    per_page = int(_POSTS_PER_LOAD.search(page).group(1))
+    posts = list(feeds.values())[:per_page]
+    if not posts:
+        return page
+
+    sections = {
+        "preload": render_preload(posts),
+        "grid": ''.join(render_card(p, i, i < PRELOAD_IMAGES) for i, p in enumerate(posts)),
+        "data": render_data(posts),
+    }
+    for name, content in sections.items():
+        page, count = _block(name).subn(lambda m: m.group(1) + content + m.group(2), page)
+        if count != 1:
+            raise ValueError(f"{INDEX_PATH}: expected one prerender:{name} block, found {count}")
+    return page
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    os.chdir(os.path.dirname(script_dir))  # Go to zen-feeds root
+
+    with open(FEEDS_PATH, 'r') as f:
+        feeds = json.load(f)
+    with open(INDEX_PATH, 'r', encoding='utf-8') as f:
+        page = f.read()
+
+    rendered = prerender(page, feeds)
+    if rendered == page:
+        print(f"{INDEX_PATH} already up to date")
+        return
+
+    with open(INDEX_PATH, 'w', encoding='utf-8') as f:
+        f.write(rendered)
+    print(f"Prerendered first page into {INDEX_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""Score curated images objectively so unscored items are not all "85".
+
+Each image is downsampled to THUMB_SIZE and scored on four metrics, all
+computed as NumPy array operations over a whole batch at once:
+- sharpness: variance of the Laplacian of the luminance;
+- exposure: mean luminance near mid-grey, minus clipped shadows/highlights;
+- contrast: standard deviation of the luminance;
+- colorfulness: Hasler & Suesstrunk's opponent-channel statistic.
+The weighted metrics map onto SCORE_RANGE, the range of curated scores.
+
+Batches are decoded and scored in a process pool. Results are cached by the
+image's content hash (from scripts/mirror.py) in quality.json, so only new
+or changed images are scored. A curated URL keeps its score after its image
+is evicted from the mirror (or while it is not mirrored), so computed
+scores do not fall back to the default and back between runs.
+iter_curated() fills in the computed score for curated items that have none.
+
+Requires numpy and Pillow. Scoring is optional: without them this exits
+with an error, the build carries on, and unscored items keep the default.
+
+Usage:
+    python scripts/quality.py             (scores mirrored curated images)
+    python scripts/quality.py FILE ...    (prints metrics for local files)
+"""
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+    from PIL import Image
+except ImportError as e:
+    sys.exit(f"quality.py needs numpy and Pillow ({e})")
+
+from curated_sources import QUALITY_PATH, iter_curated
+from mirror import Mirror
+
+# Wallpapers are 9:16 portraits; other shapes are squeezed, which barely
+# moves these global statistics
+THUMB_SIZE = (144, 256)
+BATCH_SIZE = 64
+WORKERS = os.cpu_count() or 1
+
+# Curated scores span roughly 85-99; computed ones may go lower
+SCORE_RANGE = (70, 99)
+
+WEIGHTS = {"sharpness": 0.35, "exposure": 0.25, "contrast": 0.2, "colorfulness": 0.2}
+
+# Metric values at which each component is (nearly) saturated
+SHARPNESS_REF = 0.01
+CONTRAST_REF = 0.25
+COLORFULNESS_REF = 0.3
+# Share of clipped pixels that zeroes the exposure component
+CLIP_LIMIT = 0.2
+
+_LUMA = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+def load_batch(paths):
+    """Decode and downsample images into one float32 (N, H, W, 3) array in [0, 1].
+
+    Returns (batch, loaded paths); unreadable files are left out.
+    """
+    batch = np.zeros((len(paths), THUMB_SIZE[1], THUMB_SIZE[0], 3), dtype=np.float32)
+    loaded = []
+    for path in paths:
+        try:
+            with Image.open(path) as im:
+                im.draft('RGB', THUMB_SIZE)  # cheap JPEG downscale
+                batch[len(loaded)] = np.asarray(im.convert('RGB').resize(THUMB_SIZE, Image.BILINEAR))
+        except (OSError, SyntaxError, ValueError) as e:
+            print(f"Unreadable image {path}: {e}")
+            continue
+        loaded.append(path)
+    return batch[:len(loaded)] / 255.0, loaded
+
+
+def metrics(batch):
+    """Raw metric arrays (one value per image) for a batch from load_batch()."""
+    luma = batch @ _LUMA
+    laplacian = (luma[:, 1:-1, :-2] + luma[:, 1:-1, 2:] + luma[:, :-2, 1:-1]
+                 + luma[:, 2:, 1:-1] - 4 * luma[:, 1:-1, 1:-1])
+    clipped = ((luma < 0.02) | (luma > 0.98)).mean(axis=(1, 2))
+
+    rg = batch[..., 0] - batch[..., 1]
+    yb = 0.5 * (batch[..., 0] + batch[..., 1]) - batch[..., 2]
+    colorfulness = (np.hypot(rg.std(axis=(1, 2)), yb.std(axis=(1, 2)))
+                    + 0.3 * np.hypot(rg.mean(axis=(1, 2)), yb.mean(axis=(1, 2))))
+
+    return {
+        "sharpness": laplacian.var(axis=(1, 2)),
+        "brightness": luma.mean(axis=(1, 2)),
+        "clipped": clipped,
+        "contrast": luma.std(axis=(1, 2)),
+        "colorfulness": colorfulness,
+    }
+
+
+def scores(m):
+    """Map raw metrics onto SCORE_RANGE."""
+    components = {
+        "sharpness": 1 - np.exp(-m["sharpness"] / SHARPNESS_REF),
+        "exposure": ((1 - ((m["brightness"] - 0.5) / 0.5) ** 2)
+                     * (1 - np.minimum(1, m["clipped"] / CLIP_LIMIT))),
+        "contrast": np.minimum(1, m["contrast"] / CONTRAST_REF),
+        "colorfulness": np.minimum(1, m["colorfulness"] / COLORFULNESS_REF),
+    }
+    quality = sum(WEIGHTS[name] * value for name, value in components.items())
+    low, high = SCORE_RANGE
+    return np.rint(low + (high - low) * quality).astype(int)
+
+
+def score_paths(paths):
+    """Score one batch of image files; returns a record per path (None if unreadable)."""
+    batch, loaded = load_batch(paths)
+    if not loaded:
+        return [None] * len(paths)
+    m = metrics(batch)
+    s = scores(m)
+    results = {}
+    for i, path in enumerate(loaded):
+        record = {name: round(float(values[i]), 5) for name, values in m.items()}
+        record["score"] = int(s[i])
+        results[path] = record
+    return [results.get(path) for path in paths]
+
+
+def score_all(paths, workers=WORKERS, batch_size=BATCH_SIZE):
+    """Score many files across a process pool; yields (path, record)."""
+    batches = [paths[i:i + batch_size] for i in range(0, len(paths), batch_size)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for batch, records in zip(batches, pool.map(score_paths, batches)):
+            yield from zip(batch, records)
+
+
+def load_cache():
+    if os.path.exists(QUALITY_PATH):
+        with open(QUALITY_PATH, 'r') as f:
+            return json.load(f)
+    return {"urls": {}, "objects": {}}
+
+
+def main():
+    if len(sys.argv) > 1:
+        for path, record in score_all(sys.argv[1:]):
+            if record:
+                details = ", ".join(f"{k} {v:.3f}" for k, v in record.items() if k != "score")
+                print(f"{path}: {record['score']} ({details})")
+        return
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    os.chdir(os.path.dirname(script_dir))  # Go to zen-feeds root
+
+    cache = load_cache()
+    mirror = Mirror()
+    curated = set()
+    mirrored = {}
+    for item in iter_curated(scores={}):
+        curated.add(item.get('url'))
+        entry = mirror.urls.get(item.get('url'))
+        if entry and entry['sha'] in mirror.objects:
+            mirrored[item['url']] = entry['sha']
+
+    todo = {}
+    for sha in set(mirrored.values()) - set(cache["objects"]):
+        todo[mirror.object_path(sha)] = sha
+
+    start = time.time()
+    for path, record in score_all(sorted(todo)):
+        if record:
+            cache["objects"][todo[path]] = record
+    elapsed = time.time() - start
+
+    # Scored URLs stay until they leave the curated sources; a mirrored copy
+    # only replaces the recorded hash once it has a score of its own
+    urls = {url: sha for url, sha in cache["urls"].items() if url in curated}
+    urls.update((url, sha) for url, sha in mirrored.items() if sha in cache["objects"])
+    cache["urls"] = urls
+    live = set(urls.values())
+    cache["objects"] = {sha: r for sha, r in cache["objects"].items() if sha in live}
+
+    tmp = QUALITY_PATH + ".tmp"
+    with open(tmp, 'w') as f:
+        json.dump(cache, f, separators=(',', ':'), sort_keys=True)
+    os.replace(tmp, QUALITY_PATH)
+    print(f"Scored {len(todo)} images in {elapsed:.1f}s; "
+          f"{len(urls)} of {len(curated)} curated URLs have a score "
+          f"({len(mirrored)} mirrored now)")
+
+
+if __name__ == "__main__":
+    main()
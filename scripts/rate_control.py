@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""Adaptive rate control for LLM generation calls.
+
+RateController wraps every call with:
+- a token bucket capping the request rate at the backend quota;
+- an AIMD concurrency limit that halves on rate-limit/timeout errors and
+  grows by one slot per window of successes, settling at the highest level
+  the backend sustains;
+- a circuit breaker that, after repeated failures, pauses all workers for a
+  growing cooldown and probes with a single call before resuming, instead of
+  failing the rest of the queue at full speed.
+"""
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+class BackendError(Exception):
+    """A generation call failed in a way that may succeed on retry."""
+
+
+class RateLimited(BackendError):
+    """The backend rejected the call for quota / rate reasons."""
+
+
+class BackendTimeout(BackendError):
+    """The backend did not answer in time."""
+
+
+class CircuitOpenError(Exception):
+    """The breaker tripped too often; the backend looks down."""
+
+
+class TokenBucket:
+    """Allow `rate` calls per second with bursts of up to `burst`."""
+
+    def __init__(self, rate, burst=1, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._stamp = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+                self._stamp = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens) / self.rate
+            self._sleep(delay)
+
+
+class AIMDLimiter:
+    """Concurrency limit: additive increase on success, multiplicative decrease on congestion."""
+
+    def __init__(self, initial=1, minimum=1, maximum=8, decrease=0.5):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.decrease = decrease
+        self.inflight = 0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            while self.inflight >= int(self.limit):
+                self._cond.wait()
+            self.inflight += 1
+
+    def release(self, congested=False, success=True):
+        with self._cond:
+            self.inflight -= 1
+            if congested:
+                self.limit = max(self.minimum, self.limit * self.decrease)
+            elif success:
+                # +1 slot after `limit` successes, i.e. roughly once per round trip
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+
+class CircuitBreaker:
+    """Closed -> open after `threshold` consecutive failures -> half-open probe."""
+
+    def __init__(self, threshold=5, cooldown=30.0, max_cooldown=600.0, max_trips=5,
+                 clock=time.monotonic):
+        self.threshold = threshold
+        self.base_cooldown = cooldown
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.max_trips = max_trips
+        self.state = "closed"
+        self.failures = 0
+        self.trips = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._clock = clock
+        self._cond = threading.Condition()
+
+    def before_call(self):
+        """Block while the circuit is open; raises CircuitOpenError when giving up.
+
+        Returns True if this call is the half-open probe; its outcome must be
+        reported with record_success(), record_failure() or cancel_probe().
+        """
+        with self._cond:
+            while True:
+                if self.trips > self.max_trips:
+                    raise CircuitOpenError(f"backend failing after {self.trips - 1} cooldowns")
+                if self.state == "closed":
+                    return False
+                if self.state == "open":
+                    remaining = self._opened_at + self.cooldown - self._clock()
+                    if remaining > 0:
+                        self._cond.wait(remaining)
+                        continue
+                    self.state = "half-open"
+                if not self._probing:
+                    self._probing = True
+                    return True
+                self._cond.wait()
+
+    def record_success(self):
+        with self._cond:
+            self.failures = 0
+            self._probing = False
+            if self.state != "closed":
+                print("Circuit closed, resuming")
+            self.state = "closed"
+            self.trips = 0
+            self.cooldown = self.base_cooldown
+            self._cond.notify_all()
+
+    def record_failure(self):
+        with self._cond:
+            self.failures += 1
+            if self.state == "half-open":
+                self._probing = False
+                self.cooldown = min(self.max_cooldown, self.cooldown * 2)
+                self._open()
+            elif self.state == "closed" and self.failures >= self.threshold:
+                self._open()
+            self._cond.notify_all()
+
+    def cancel_probe(self):
+        """The probe ended without a verdict on the backend; let another call probe."""
+        with self._cond:
+            self._probing = False
+            self._cond.notify_all()
+
+    def _open(self):
+        self.state = "open"
+        self.trips += 1
+        self._opened_at = self._clock()
+        if self.trips <= self.max_trips:
+            print(f"Circuit open after {self.failures} failures, pausing {self.cooldown:.0f}s")
+
+
+class RateController:
+    """Run generation calls through the bucket, limiter and breaker."""
+
+    @classmethod
+    def for_build(cls, **kwargs):
+        """A controller for build stages: gives up on an outage within seconds.
+
+        The default breaker waits out about 15 minutes of cooldowns, which
+        holds up the whole build; a stage would rather fail fast and be
+        retried on the next build.
+        """
+        breaker = CircuitBreaker(threshold=3, cooldown=5.0, max_cooldown=10.0, max_trips=1)
+        return cls(breaker=breaker, **kwargs)
+
+    def __init__(self, rate=1.0, burst=2, max_concurrency=4, attempts=3,
+                 bucket=None, limiter=None, breaker=None):
+        self.bucket = bucket or TokenBucket(rate, burst)
+        self.limiter = limiter or AIMDLimiter(maximum=max_concurrency)
+        self.breaker = breaker or CircuitBreaker()
+        self.max_concurrency = max_concurrency
+        self.attempts = attempts
+
+    def call(self, fn, *args):
+        probe = self.breaker.before_call()
+        try:
+            self.limiter.acquire()
+        except BaseException:
+            if probe:
+                self.breaker.cancel_probe()
+            raise
+        try:
+            self.bucket.acquire()
+            result = fn(*args)
+        except (RateLimited, BackendTimeout):
+            self.limiter.release(congested=True)
+            self.breaker.record_failure()
+            raise
+        except BackendError:
+            self.limiter.release(success=False)
+            self.breaker.record_failure()
+            raise
+        except BaseException:
+            # Not a backend failure, but a probe must not keep the others waiting
+            self.limiter.release(success=False)
+            if probe:
+                self.breaker.cancel_probe()
+            raise
+        self.limiter.release()
+        self.breaker.record_success()
+        return result
+
+    def map(self, fn, items):
+        """Call fn(item) for every item; yields (item, result, error) as they finish.
+
+        BackendErrors are retried up to `attempts` times. If the breaker gives
+        up, items not yet attempted are yielded with the CircuitOpenError so
+        callers can leave them for the next run. Other exceptions propagate.
+        """
+        queue = [(item, 1) for item in items]
+        running = {}
+        aborted = None
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+            while queue or running:
+                while queue and not aborted and len(running) < self.max_concurrency:
+                    item, attempt = queue.pop(0)
+                    running[pool.submit(self.call, fn, item)] = (item, attempt)
+                if aborted:
+                    for item, _ in queue:
+                        yield item, None, aborted
+                    queue = []
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    item, attempt = running.pop(future)
+                    try:
+                        yield item, future.result(), None
+                    except CircuitOpenError as e:
+                        aborted = e
+                        yield item, None, e
+                    except BackendError as e:
+                        if attempt < self.attempts:
+                            queue.append((item, attempt + 1))
+                        else:
+                            yield item, None, e
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""Reconcile feeds.json with the curated sources (three-way).
+
+Unlike sync_from_curated.py (full rebuild) and sync_new_curated.py (adds
+only), this applies every kind of change in one linear pass over the merged
+curated stream, using hashed ID indexes:
+- new curated items are added (same entries as sync_new_curated.py);
+- source-owned fields (url, score, author) are updated when curation changed
+  them since the last reconcile, while local edits to fields curation did
+  not touch are kept; generated fields (title, summary, article, ...) are
+  never touched;
+- feed entries no longer curated are moved to tombstones.json, and restored
+  with their enrichments if they come back.
+
+The last curated values are kept in curated_base.json (the merge base), and
+the changes are written to changeset.json for incremental downstream steps.
+
+Usage: python scripts/reconcile_curated.py [--dry-run] [--allow-mass-delete]
+"""
+import argparse
+import json
+import os
+from datetime import date
+
+from curated_sources import iter_curated
+from sync_new_curated import OUTPUT_PATH, build_entries
+
+BASE_PATH = "curated_base.json"
+TOMBSTONES_PATH = "tombstones.json"
+CHANGESET_PATH = "changeset.json"
+
+# Fields owned by curation, with the defaults the sync scripts apply
+SOURCE_FIELDS = {"url": None, "score": 85, "author": "Unknown"}
+
+# Refuse to tombstone more than this share of the feed in one run
+MAX_DELETE_FRACTION = 0.5
+
+
+def load_json(path, default):
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            return json.load(f)
+    return default
+
+
+def write_json(path, data, **kwargs):
+    tmp = path + ".tmp"
+    with open(tmp, 'w') as f:
+        json.dump(data, f, ensure_ascii=False, **kwargs)
+    os.replace(tmp, path)
+
+
+def source_values(item):
+    return {field: item.get(field, default) for field, default in SOURCE_FIELDS.items()}
+
+
+def merge_fields(entry, theirs, base):
+    """Three-way merge of source-owned fields into entry.
+
+    Returns (changed fields, conflicting fields). Curation wins whenever it
+    changed a field since base; otherwise a local edit is kept.
+    """
+    changed, conflicts = [], []
+    for field, value in theirs.items():
+        ours = entry.get(field)
+        if ours == value:
+            continue
+        if base is None or base.get(field) != value:
+            if base is not None and ours != base.get(field):
+                conflicts.append(field)
+            entry[field] = value
+            changed.append(field)
+    return changed, conflicts
+
+
+def reconcile(feeds, curated, base, tombstones, today):
+    """Apply curated changes to feeds in place; returns (changeset, new base)."""
+    changeset = {"added": [], "updated": {}, "restored": [], "removed": [], "conflicts": {}}
+    new_base = {}
+    new_items = []
+
+    for item in curated:
+        feed_id = item['id']
+        theirs = source_values(item)
+        new_base[feed_id] = theirs
+
+        if feed_id in feeds:
+            changed, conflicts = merge_fields(feeds[feed_id], theirs, base.get(feed_id))
+        elif feed_id in tombstones:
+            feeds[feed_id] = tombstones.pop(feed_id)['record']
+            changed, conflicts = merge_fields(feeds[feed_id], theirs, base.get(feed_id))
+            changeset["restored"].append(feed_id)
+        else:
+            new_items.append(item)
+            continue
+        if changed:
+            changeset["updated"][feed_id] = changed
+        if conflicts:
+            changeset["conflicts"][feed_id] = conflicts
+
+    for feed_id in [f for f in feeds if f not in new_base]:
+        tombstones[feed_id] = {"removed": today, "record": feeds.pop(feed_id)}
+        changeset["removed"].append(feed_id)
+
+    entries = build_entries(new_items)
+    feeds.update(entries)
+    changeset["added"] = list(entries)
+    return changeset, new_base
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    os.chdir(os.path.dirname(script_dir))  # Go to zen-feeds root
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dry-run", action="store_true", help="report changes without writing")
+    parser.add_argument("--allow-mass-delete", action="store_true",
+                        help=f"allow removing more than {MAX_DELETE_FRACTION:.0%} of the feed")
+    args = parser.parse_args()
+
+    with open(OUTPUT_PATH, 'r') as f:
+        feeds = json.load(f)
+    base = load_json(BASE_PATH, {})
+    tombstones = load_json(TOMBSTONES_PATH, {})
+    total = len(feeds)
+
+    changeset, new_base = reconcile(feeds, iter_curated(), base, tombstones, date.today().isoformat())
+
+    print(f"Added: {len(changeset['added'])}, updated: {len(changeset['updated'])}, "
+          f"restored: {len(changeset['restored'])}, removed: {len(changeset['removed'])}")
+    for feed_id, fields in changeset["conflicts"].items():
+        print(f"  {feed_id}: local edits to {', '.join(fields)} replaced by curation")
+
+    if not new_base:
+        print("Curated sources are empty; refusing to reconcile.")
+        raise SystemExit(1)
+    if total and len(changeset["removed"]) > MAX_DELETE_FRACTION * total and not args.allow_mass_delete:
+        print(f"Refusing to remove {len(changeset['removed'])} of {total} entries "
+              f"(use --allow-mass-delete).")
+        raise SystemExit(1)
+    if args.dry_run:
+        return
+
+    write_json(CHANGESET_PATH, changeset, indent=2)
+    if any(changeset[k] for k in ("added", "updated", "restored", "removed")):
+        write_json(OUTPUT_PATH, feeds, indent=2)
+        write_json(TOMBSTONES_PATH, tombstones, indent=2)
+    if new_base != base:
+        write_json(BASE_PATH, new_base, separators=(',', ':'), sort_keys=True)
+    print(f"Total feeds: {len(feeds)}")
+
+
+if __name__ == "__main__":
+    main()
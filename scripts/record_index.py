@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""Random access to single feed records through a memory-mapped ID index.
+
+The build writes two files:
+- feeds.rec: every record as compact JSON, one per line
+- feeds.idx: a header plus fixed-width (id, offset, length) slots sorted by id
+
+Lookups mmap both files and binary-search the slots, so reading one record
+touches a handful of pages regardless of catalog size. get_raw() returns a
+zero-copy memoryview into feeds.rec.
+
+Usage:
+    python scripts/record_index.py build
+    python scripts/record_index.py show zen-0001
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+
+FEEDS_PATH = "feeds.json"
+RECORDS_PATH = "feeds.rec"
+INDEX_PATH = "feeds.idx"
+
+MAGIC = b"ZIDX"
+VERSION = 1
+# magic, version, record count, key width
+HEADER = struct.Struct("<4sHIH")
+
+
+def _slot(key_width):
+    # id (NUL padded), record offset, record length
+    return struct.Struct(f"<{key_width}sQI")
+
+
+def build_index(feeds, records_path=RECORDS_PATH, index_path=INDEX_PATH):
+    """Write the record file and its sorted index. Returns the record count."""
+    keys = sorted(feed_id.encode('utf-8') for feed_id in feeds)
+    key_width = max((len(k) for k in keys), default=1)
+    slot = _slot(key_width)
+
+    slots = []
+    offset = 0
+    with open(records_path + ".tmp", 'wb') as rec:
+        for key in keys:
+            data = json.dumps(feeds[key.decode('utf-8')], ensure_ascii=False,
+                              separators=(',', ':')).encode('utf-8')
+            rec.write(data + b"\n")
+            slots.append(slot.pack(key, offset, len(data)))
+            offset += len(data) + 1
+
+    with open(index_path + ".tmp", 'wb') as idx:
+        idx.write(HEADER.pack(MAGIC, VERSION, len(keys), key_width))
+        idx.writelines(slots)
+
+    os.replace(records_path + ".tmp", records_path)
+    os.replace(index_path + ".tmp", index_path)
+    return len(keys)
+
+
+class RecordIndex:
+    """Read-only view over feeds.idx / feeds.rec."""
+
+    def __init__(self, index_path=INDEX_PATH, records_path=RECORDS_PATH):
+        with open(index_path, 'rb') as f:
+            self._idx = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        with open(records_path, 'rb') as f:
+            # mmap refuses empty files; an empty catalog has no records anyway
+            size = os.fstat(f.fileno()).st_size
+            self._rec = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+
+        magic, version, self.count, self.key_width = HEADER.unpack_from(self._idx, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{index_path}: not a version {VERSION} record index")
+        self._slot = _slot(self.key_width)
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Unmap the files; views from get_raw() must be released first."""
+        self._idx.close()
+        if self._rec is not None:
+            self._rec.close()
+
+    def _find(self, feed_id):
+        key = feed_id.encode('utf-8')
+        if len(key) > self.key_width:
+            return None
+        key = key.ljust(self.key_width, b"\0")
+        lo, hi = 0, self.count
+        base, size, width = HEADER.size, self._slot.size, self.key_width
+        while lo < hi:
+            mid = (lo + hi) // 2
+            pos = base + mid * size
+            probe = self._idx[pos:pos + width]
+            if probe < key:
+                lo = mid + 1
+            elif probe > key:
+                hi = mid
+            else:
+                _, offset, length = self._slot.unpack_from(self._idx, pos)
+                return offset, length
+        return None
+
+    def __contains__(self, feed_id):
+        return self._find(feed_id) is not None
+
+    def get_raw(self, feed_id):
+        """Zero-copy memoryview of a record's JSON bytes, or None."""
+        found = self._find(feed_id)
+        if found is None:
+            return None
+        offset, length = found
+        return memoryview(self._rec)[offset:offset + length]
+
+    def get(self, feed_id):
+        """Decoded record, or None."""
+        view = self.get_raw(feed_id)
+        if view is None:
+            return None
+        with view:
+            return json.loads(bytes(view))
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    os.chdir(os.path.dirname(script_dir))  # Go to zen-feeds root
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "build"
+    if command == "build":
+        with open(FEEDS_PATH, 'r') as f:
+            feeds = json.load(f)
+        count = build_index(feeds)
+        print(f"Indexed {count} records into {RECORDS_PATH} / {INDEX_PATH}")
+    elif command == "show" and len(sys.argv) == 3:
+        with RecordIndex() as index:
+            record = index.get(sys.argv[2])
+        if record is None:
+            print(f"{sys.argv[2]} not found")
+            sys.exit(1)
+        print(json.dumps(record, indent=2, ensure_ascii=False))
+    else:
+        print(__doc__.split("Usage:")[1].rstrip())
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""Deterministic daily rotation of featured entries, published as today.json.
+
+Days are planned once and then never change: the plan is kept in
+rotation.json, each run plans only the days up to today + PREFETCH_DAYS
+that are not planned yet, and entries added to the catalog later only
+compete for those new days. Each day's picks:
+- favour the entries most overdue for their turn: every entry comes round
+  once per cycle (catalog size / PER_DAY days), high-scoring entries more
+  often, and an entry that was never featured starts at a stable
+  pseudo-random point of its interval so new batches are spread out;
+- interleave categories in proportion to their size (smooth weighted
+  round robin, its credits kept in the plan), so every day gets a
+  balanced mix;
+- never repeat an entry within NO_REPEAT_DAYS (or within one cycle, for
+  catalogs too small to fill the window).
+
+Usage: python scripts/rotation.py [--date YYYY-MM-DD] [--days N]
+"""
+import argparse
+import json
+import os
+import zlib
+from datetime import date, timedelta
+
+FEEDS_PATH = "feeds.json"
+TODAY_PATH = "today.json"
+PLAN_PATH = "rotation.json"
+
+PER_DAY = 3
+PREFETCH_DAYS = 7        # days after today included for offline use
+NO_REPEAT_DAYS = 30
+
+# Score thresholds that earn an extra appearance per cycle
+BONUS_SCORES = (90, 95)
+
+# Fields published per featured entry (articles stay in feeds.json)
+CARD_FIELDS = ("id", "url", "author", "title", "summary", "category", "score")
+
+
+def _unit(key):
+    """Stable pseudo-random offset in [0, 1) for a key."""
+    return zlib.crc32(key.encode('utf-8')) / 2 ** 32
+
+
+def copies_for(entry, max_copies):
+    score = entry.get('score', 85)
+    return min(max_copies, 1 + sum(score >= s for s in BONUS_SCORES))
+
+
+def load_plan():
+    if os.path.exists(PLAN_PATH):
+        with open(PLAN_PATH, 'r') as f:
+            return json.load(f)
+    return {"days": {}, "last": {}, "since": {}, "credit": {}}
+
+
+def _category(entry):
+    return entry.get('category', 'nature')
+
+
+def intervals(feeds, per_day=PER_DAY, window=NO_REPEAT_DAYS):
+    """Days between an entry's turns per feed ID, slot weight per category,
+    and the effective no-repeat window."""
+    # Cap the copies so that an entry's turns stay a window apart
+    max_copies = max(1, len(feeds) // (per_day * window))
+    copies = {feed_id: copies_for(entry, max_copies) for feed_id, entry in feeds.items()}
+    cycle = sum(copies.values()) / per_day
+    weights = {}
+    for feed_id, n in copies.items():
+        category = _category(feeds[feed_id])
+        weights[category] = weights.get(category, 0) + n
+    window = max(0, min(window, int(len(feeds) / per_day) - 1))
+    return {feed_id: max(cycle / n, window + 1) for feed_id, n in copies.items()}, weights, window
+
+
+def pick_day(feeds, plan, day, interval, weights, window, per_day=PER_DAY):
+    """IDs to feature on `day` (a date), given what was featured before it."""
+    since = plan.setdefault("since", {})
+    credit = plan.setdefault("credit", {})
+
+    def turn_started(feed_id):
+        if feed_id in plan["last"]:
+            return date.fromisoformat(plan["last"][feed_id])
+        if feed_id not in since:
+            # Never featured: due somewhere within its first interval
+            start = day - timedelta(days=int(_unit(feed_id) * interval[feed_id]))
+            since[feed_id] = start.isoformat()
+        return date.fromisoformat(since[feed_id])
+
+    def priority(feed_id):
+        overdue = (day - turn_started(feed_id)).days / interval[feed_id]
+        return overdue, _unit(f"{feed_id}:{day.isoformat()}")
+
+    def eligible(feed_id):
+        last = plan["last"].get(feed_id)
+        return last is None or (day - date.fromisoformat(last)).days > window
+
+    queues = {}
+    for feed_id in sorted([f for f in feeds if eligible(f)] or feeds, key=priority):
+        queues.setdefault(_category(feeds[feed_id]), []).append(feed_id)  # most overdue last
+
+    # Smooth weighted round robin across categories, continued from the last day
+    for category in list(credit):
+        if category not in weights:
+            del credit[category]
+    total = sum(weights.values())
+    picked = []
+    while len(picked) < per_day and any(queues.values()):
+        for category, weight in weights.items():
+            credit[category] = credit.get(category, 0) + weight
+        category = max((c for c in queues if queues[c]), key=lambda c: (credit[c], c))
+        credit[category] -= total
+        picked.append(queues[category].pop())
+    return picked
+
+
+def plan_days(feeds, plan, first, last_day, per_day=PER_DAY, window=NO_REPEAT_DAYS):
+    """Plan every day from `first` to `last_day` not planned yet; returns how many were added.
+
+    Days already in the plan are kept as they are, so published days and
+    prefetched future days stay stable as the catalog changes.
+    """
+    if not feeds:
+        return 0
+    interval, weights, window = intervals(feeds, per_day, window)
+    added = 0
+    day = first
+    while day <= last_day:
+        key = day.isoformat()
+        if key not in plan["days"]:
+            plan["days"][key] = pick_day(feeds, plan, day, interval, weights, window, per_day)
+            for feed_id in plan["days"][key]:
+                plan["last"][feed_id] = key
+                plan["since"].pop(feed_id, None)
+            added += 1
+        day += timedelta(days=1)
+    return added
+
+
+def prune_plan(plan, feeds, today, keep=NO_REPEAT_DAYS):
+    """Drop days older than the no-repeat window and entries no longer in the feed."""
+    cutoff = (today - timedelta(days=keep)).isoformat()
+    plan["days"] = {d: ids for d, ids in plan["days"].items() if d >= cutoff}
+    plan["last"] = {f: d for f, d in plan["last"].items() if f in feeds}
+    plan["since"] = {f: d for f, d in plan.get("since", {}).items() if f in feeds}
+
+
+def min_repeat_gap(plan):
+    """Smallest distance in days between two planned appearances of one entry."""
+    seen = {}
+    gap = None
+    for key in sorted(plan["days"]):
+        day = date.fromisoformat(key)
+        for feed_id in plan["days"][key]:
+            if feed_id in seen:
+                d = (day - seen[feed_id]).days
+                gap = d if gap is None else min(gap, d)
+            seen[feed_id] = day
+    return gap
+
+
+def build_today(feeds, plan, today, days=PREFETCH_DAYS):
+    result = {"date": today.isoformat(), "days": []}
+    for offset in range(days + 1):
+        day = today + timedelta(days=offset)
+        entries = [
+            {k: feeds[f][k] for k in CARD_FIELDS if k in feeds[f]}
+            for f in plan["days"].get(day.isoformat(), []) if f in feeds
+        ]
+        result["days"].append({"date": day.isoformat(), "entries": entries})
+    return result
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    os.chdir(os.path.dirname(script_dir))  # Go to zen-feeds root
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--date", type=date.fromisoformat, default=date.today())
+    parser.add_argument("--days", type=int, default=PREFETCH_DAYS, help="extra days to include")
+    args = parser.parse_args()
+
+    with open(FEEDS_PATH, 'r') as f:
+        feeds = json.load(f)
+
+    plan = load_plan()
+    prune_plan(plan, feeds, args.date)
+    added = plan_days(feeds, plan, args.date, args.date + timedelta(days=args.days))
+    today = build_today(feeds, plan, args.date, args.days)
+
+    tmp = PLAN_PATH + ".tmp"
+    with open(tmp, 'w') as f:
+        json.dump(plan, f, indent=1, sort_keys=True)
+    os.replace(tmp, PLAN_PATH)
+    with open(TODAY_PATH, 'w') as f:
+        json.dump(today, f, ensure_ascii=False, separators=(',', ':'))
+
+    gap = min_repeat_gap(plan)
+    print(f"Planned {added} new days ({len(plan['days'])} kept), "
+          f"min repeat gap {gap if gap is not None else '-'} days")
+    print(f"Wrote {TODAY_PATH} ({os.path.getsize(TODAY_PATH)} bytes, {args.days + 1} days)")
+
+
+if __name__ == "__main__":
+    main()
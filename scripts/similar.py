@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""Precompute "more like this" neighbor lists for every feed entry.
+
+Each entry gets a compact feature vector: a color histogram of its image
+(when scripts/mirror.py has a local copy), its category tags and a hashed
+bag of words from its text. Top-k cosine neighbors are found with a blocked matrix
+product, so memory stays bounded by the block size rather than N^2.
+
+Requires numpy and Pillow.
+
+Usage: python scripts/similar.py  (writes similar.json)
+"""
+import json
+import os
+import re
+import zlib
+
+import numpy as np
+from PIL import Image
+
+from mirror import Mirror
+
+FEEDS_PATH = "feeds.json"
+TAGS_PATH = "tags.json"
+SIMILAR_PATH = "similar.json"
+
+TOP_K = 12
+ROW_BLOCK = 512
+COL_BLOCK = 16384
+
+HIST_BINS = 4         # per RGB channel -> 64 color features
+THUMB_SIZE = 64       # images are downsampled before histogramming
+TEXT_DIMS = 128       # hashed bag-of-words features
+
+# Relative weight of each feature group in the cosine similarity
+WEIGHTS = {"image": 1.0, "tags": 0.6, "text": 0.4}
+
+_WORD = re.compile(r"[a-z']+")
+
+
+def _normalize_rows(m):
+    norms = np.linalg.norm(m, axis=1, keepdims=True)
+    return m / np.maximum(norms, 1e-12)
+
+
+def image_features(paths):
+    """RGB color histograms; rows without a local image stay zero."""
+    feats = np.zeros((len(paths), HIST_BINS ** 3), dtype=np.float32)
+    for i, path in enumerate(paths):
+        if path is None:
+            continue
+        with Image.open(path) as im:
+            im.draft('RGB', (THUMB_SIZE, THUMB_SIZE))  # cheap JPEG downscale
+            pixels = np.asarray(im.convert('RGB').resize((THUMB_SIZE, THUMB_SIZE)))
+        q = (pixels.reshape(-1, 3).astype(np.uint16) * HIST_BINS) >> 8
+        codes = (q[:, 0] * HIST_BINS + q[:, 1]) * HIST_BINS + q[:, 2]
+        feats[i] = np.bincount(codes, minlength=HIST_BINS ** 3)
+    return _normalize_rows(feats)
+
+
+def tag_features(ids, feeds, postings):
+    tags = sorted(set(postings) | {e.get('category', '') for e in feeds.values()} - {''})
+    col = {tag: j for j, tag in enumerate(tags)}
+    row = {feed_id: i for i, feed_id in enumerate(ids)}
+    feats = np.zeros((len(ids), len(tags)), dtype=np.float32)
+    for tag, tagged in postings.items():
+        rows = [row[f] for f in tagged if f in row]
+        feats[rows, col[tag]] = 1.0
+    for i, feed_id in enumerate(ids):
+        category = feeds[feed_id].get('category')
+        if category:
+            feats[i, col[category]] = 1.0
+    return _normalize_rows(feats)
+
+
+def text_features(ids, feeds):
+    """Hashed bag of words over title, summary and article headline."""
+    feats = np.zeros((len(ids), TEXT_DIMS), dtype=np.float32)
+    for i, feed_id in enumerate(ids):
+        entry = feeds[feed_id]
+        article = entry.get('article')
+        headline = article.get('headline', '') if isinstance(article, dict) else ''
+        text = ' '.join([entry.get('title', ''), entry.get('summary', ''), headline])
+        for word in _WORD.findall(text.lower()):
+            feats[i, zlib.crc32(word.encode()) % TEXT_DIMS] += 1.0
+    return _normalize_rows(feats)
+
+
+def build_vectors(ids, feeds, postings):
+    mirror = Mirror()
+    paths = [mirror.path(feeds[feed_id]['url']) for feed_id in ids]
+    groups = {
+        "image": image_features(paths),
+        "tags": tag_features(ids, feeds, postings),
+        "text": text_features(ids, feeds),
+    }
+    vectors = np.hstack([groups[name] * np.sqrt(w) for name, w in WEIGHTS.items()])
+    return _normalize_rows(vectors).astype(np.float32), sum(p is not None for p in paths)
+
+
+def top_k_neighbors(vectors, k=TOP_K, row_block=ROW_BLOCK, col_block=COL_BLOCK):
+    """Indices of the k most similar rows for every row, best first.
+
+    Works on row_block x col_block tiles, keeping a running top-k per row.
+    """
+    n = len(vectors)
+    k = min(k, n - 1)
+    result = np.empty((n, max(k, 0)), dtype=np.int64)
+    if k <= 0:
+        return result
+    for r0 in range(0, n, row_block):
+        q = vectors[r0:r0 + row_block]
+        rows = np.arange(len(q))
+        best_sim = np.full((len(q), k), -np.inf, dtype=np.float32)
+        best_idx = np.zeros((len(q), k), dtype=np.int64)
+        for c0 in range(0, n, col_block):
+            sims = q @ vectors[c0:c0 + col_block].T
+            # Never pick an entry as its own neighbor
+            self_cols = rows + r0 - c0
+            mask = (self_cols >= 0) & (self_cols < sims.shape[1])
+            sims[rows[mask], self_cols[mask]] = -np.inf
+            cand_sim = np.hstack([best_sim, sims])
+            cand_idx = np.hstack([best_idx, np.broadcast_to(np.arange(c0, c0 + sims.shape[1]), sims.shape)])
+            keep = np.argpartition(-cand_sim, k - 1, axis=1)[:, :k]
+            best_sim = np.take_along_axis(cand_sim, keep, axis=1)
+            best_idx = np.take_along_axis(cand_idx, keep, axis=1)
+        order = np.argsort(-best_sim, axis=1)
+        result[r0:r0 + len(q)] = np.take_along_axis(best_idx, order, axis=1)
+    return result
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    os.chdir(os.path.dirname(script_dir))  # Go to zen-feeds root
+
+    with open(FEEDS_PATH, 'r') as f:
+        feeds = json.load(f)
+    postings = {}
+    if os.path.exists(TAGS_PATH):
+        with open(TAGS_PATH, 'r') as f:
+            postings = json.load(f)
+
+    ids = sorted(feeds)
+    vectors, with_images = build_vectors(ids, feeds, postings)
+    neighbors = top_k_neighbors(vectors)
+
+    similar = {feed_id: [ids[j] for j in row] for feed_id, row in zip(ids, neighbors)}
+    with open(SIMILAR_PATH, 'w') as f:
+        json.dump(similar, f, separators=(',', ':'))
+
+    print(f"Indexed {len(ids)} entries ({with_images} with local images)")
+    print(f"Wrote top-{neighbors.shape[1]} neighbors to {SIMILAR_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""Local stand-in for the Gemini REST API, for offline tests and benchmarks.
+
+Serves generateContent and streamGenerateContent (SSE) over HTTP/1.1
+keep-alive and can inject latency, quota errors (429), server errors (500)
+and malformed JSON replies at configurable rates.
+
+Usage:
+    python scripts/stub_gemini_server.py --port 8765 --latency 200 --rate-limit 0.1
+        then: ZEN_GENERATION_BACKEND=http GEMINI_API_URL=http://127.0.0.1:8765 \\
+              python scripts/generate_feeds.py
+    python scripts/stub_gemini_server.py --bench 200 [--stream] [--malformed 0.05]
+        runs the server in-process and pushes N generations through
+        RateController + HTTPBackend, reporting throughput and outcomes.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from generation_backends import HTTPBackend
+from mirror import ConnectionPool
+from rate_control import CircuitBreaker, RateController
+
+REPLY = {
+    "title": "Still Water",
+    "summary": "A quiet surface holds the whole sky.",
+    "article": "Stillness is not the absence of motion.\n\nIt is the ground motion returns to.",
+}
+
+
+class StubConfig:
+    def __init__(self, latency=0.0, jitter=0.0, rate_limit=0.0, server_error=0.0, malformed=0.0,
+                 seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.server_error = server_error
+        self.malformed = malformed
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = Counter()
+
+    def roll(self):
+        """Pick this request's outcome and delay."""
+        with self.lock:
+            r = self.random.random()
+            delay = max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter))
+        if r < self.rate_limit:
+            outcome = "rate_limit"
+        elif r < self.rate_limit + self.server_error:
+            outcome = "server_error"
+        elif r < self.rate_limit + self.server_error + self.malformed:
+            outcome = "malformed"
+        else:
+            outcome = "ok"
+        with self.lock:
+            self.requests[outcome] += 1
+        return outcome, delay
+
+
+def _envelope(text):
+    return {"candidates": [{"content": {"parts": [{"text": text}], "role": "model"}}]}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    config = StubConfig()
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body, content_type="application/json"):
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        if ":generateContent" not in self.path and ":streamGenerateContent" not in self.path:
+            self._send(404, json.dumps({"error": {"code": 404, "message": "not found"}}))
+            return
+
+        outcome, delay = self.config.roll()
+        time.sleep(delay)
+        if outcome == "rate_limit":
+            self._send(429, json.dumps({"error": {"code": 429, "status": "RESOURCE_EXHAUSTED"}}))
+            return
+        if outcome == "server_error":
+            self._send(500, json.dumps({"error": {"code": 500, "status": "INTERNAL"}}))
+            return
+
+        text = json.dumps(REPLY)
+        if outcome == "malformed":
+            text = text[:len(text) // 2]  # truncated JSON
+
+        if ":streamGenerateContent" in self.path:
+            # Split the reply over a few SSE events, sent with chunked encoding
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            step = max(1, len(text) // 3)
+            for i in range(0, len(text), step):
+                event = f"data: {json.dumps(_envelope(text[i:i + step]))}\r\n\r\n".encode('utf-8')
+                self.wfile.write(f"{len(event):x}\r\n".encode() + event + b"\r\n")
+            self.wfile.write(b"0\r\n\r\n")
+        else:
+            self._send(200, json.dumps(_envelope(text)))
+
+
+def serve(port, config):
+    handler = type("ConfiguredStubHandler", (StubHandler,), {"config": config})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def bench(server, config, count, stream, concurrency):
+    url = f"http://127.0.0.1:{server.server_port}"
+    backend = HTTPBackend(api_url=url, stream=stream, pool=ConnectionPool(per_host=concurrency))
+    controller = RateController(rate=1000, burst=concurrency, max_concurrency=concurrency,
+                                breaker=CircuitBreaker(cooldown=1.0))
+    results = Counter()
+    start = time.time()
+    for _, content, error in controller.map(backend.generate, range(count)):
+        results["ok" if content else type(error).__name__ if error else "unusable"] += 1
+    elapsed = time.time() - start
+    backend.close()
+
+    print(f"{count} generations in {elapsed:.2f}s ({count / elapsed:.1f}/s), "
+          f"final concurrency limit {controller.limiter.limit:.1f}")
+    print(f"Outcomes: {dict(results)}")
+    print(f"Server saw: {dict(config.requests)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=50, help="mean latency in ms")
+    parser.add_argument("--jitter", type=float, default=0, help="latency jitter in ms")
+    parser.add_argument("--rate-limit", type=float, default=0, help="share of 429 replies")
+    parser.add_argument("--server-error", type=float, default=0, help="share of 500 replies")
+    parser.add_argument("--malformed", type=float, default=0, help="share of malformed JSON replies")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--bench", type=int, metavar="N", help="run N generations against the stub and exit")
+    parser.add_argument("--stream", action="store_true", help="benchmark the streaming endpoint")
+    parser.add_argument("--concurrency", type=int, default=8, help="benchmark concurrency ceiling")
+    args = parser.parse_args()
+
+    config = StubConfig(args.latency / 1000, args.jitter / 1000, args.rate_limit,
+                        args.server_error, args.malformed, args.seed)
+    server = serve(0 if args.bench else args.port, config)
+
+    if args.bench:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            bench(server, config, args.bench, args.stream, args.concurrency)
+        finally:
+            server.shutdown()
+        return
+
+    print(f"Stub Gemini API on http://127.0.0.1:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Stopped.")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,8 @@
 import json
 import os
 
-CURATED_PATH = "../zen-wallpapers/s-grade-curated.json"
+from curated_sources import iter_curated
+
 OUTPUT_PATH = "feeds.json"
 
 # Zen quotes for variety
@@ -24,11 +25,8 @@ def main():
     script_dir = os.path.dirname(os.path.abspath(__file__))
     os.chdir(os.path.dirname(script_dir))  # Go to zen-feeds root
     
-    with open(CURATED_PATH, 'r') as f:
-        curated = json.load(f)
-    
     feeds = {}
-    for i, item in enumerate(curated):
+    for i, item in enumerate(iter_curated()):
         title, summary = QUOTES[i % len(QUOTES)]
         feeds[item['id']] = {
             "id": item['id'],
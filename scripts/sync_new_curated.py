@@ -5,15 +5,10 @@ import os
 import random
 import re
 
-CURATED_PATH = "../zen-wallpapers/s-grade-curated.json"
-OUTPUT_PATH = "feeds.json"
+from curated_sources import iter_curated
+from tagger import DEFAULT_CATEGORY, TAGGER
 
-# Map curation themes to categories
-THEME_TO_CATEGORY = {
-    "Zen/Nature": "nature",
-    "Food/Culinary": "food",
-    "Travel/Landscape": "travel"
-}
+OUTPUT_PATH = "feeds.json"
 
 # Zen content pools
 ZEN_TITLES = [
@@ -119,49 +114,25 @@ ARTICLES = {
 }
 
 def extract_category(reason):
-    """Extract category from curation reason."""
-    for theme, cat in THEME_TO_CATEGORY.items():
-        if theme in reason:
-            return cat
-    return "nature"  # default
+    """Extract the primary category from curation reason."""
+    return TAGGER.primary(reason)
 
-def main():
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    os.chdir(os.path.dirname(script_dir))  # Go to zen-feeds root
-    
-    # Load existing feeds
-    with open(OUTPUT_PATH, 'r') as f:
-        feeds = json.load(f)
-    
-    existing_ids = set(feeds.keys())
-    print(f"Existing feeds: {len(existing_ids)}")
-    
-    # Load curated images
-    with open(CURATED_PATH, 'r') as f:
-        curated = json.load(f)
-    
-    # Find new images
-    new_items = [item for item in curated if item['id'] not in existing_ids]
-    print(f"New images to add: {len(new_items)}")
-    
-    if not new_items:
-        print("No new images to sync.")
-        return
-    
+def build_entries(new_items):
+    """Create feed entries for newly curated items, keyed by ID."""
     # Shuffle pools for variety
     titles = ZEN_TITLES.copy()
     summaries = ZEN_SUMMARIES.copy()
     random.shuffle(titles)
     random.shuffle(summaries)
     
-    added = 0
+    entries = {}
     for i, item in enumerate(new_items):
         category = extract_category(item.get('reason', ''))
         title = titles[i % len(titles)]
         summary = summaries[i % len(summaries)]
-        article = random.choice(ARTICLES[category])
+        article = random.choice(ARTICLES.get(category, ARTICLES[DEFAULT_CATEGORY]))
         
-        feeds[item['id']] = {
+        entries[item['id']] = {
             "id": item['id'],
             "url": item['url'],
             "author": item.get('author', 'Unknown'),
@@ -172,7 +143,30 @@ def main():
             "category": category,
             "article": article
         }
-        added += 1
+    return entries
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    os.chdir(os.path.dirname(script_dir))  # Go to zen-feeds root
+    
+    # Load existing feeds
+    with open(OUTPUT_PATH, 'r') as f:
+        feeds = json.load(f)
+    
+    existing_ids = set(feeds.keys())
+    print(f"Existing feeds: {len(existing_ids)}")
+    
+    # Stream curated images from every source, deduplicated by ID
+    new_items = [item for item in iter_curated() if item['id'] not in existing_ids]
+    print(f"New images to add: {len(new_items)}")
+    
+    if not new_items:
+        print("No new images to sync.")
+        return
+    
+    entries = build_entries(new_items)
+    feeds.update(entries)
+    added = len(entries)
     
     # Save updated feeds
     with open(OUTPUT_PATH, 'w') as f:
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""Export feeds.json as RSS 2.0, Atom and JSON Feed.
+
+Entries are streamed through incremental writers one at a time. Besides the
+subscription documents (newest PAGE_SIZE entries), the catalog is split into
+fixed archive pages in feed order (RFC 5005 style), so appending entries only
+touches the newest archive. A page is rewritten only when the hash of its
+entries and links changes.
+
+Usage: python scripts/syndication.py  (writes syndication/)
+"""
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from html import escape
+from xml.sax.saxutils import XMLGenerator
+
+from curated_sources import DATE_FORMATS
+
+FEEDS_PATH = "feeds.json"
+OUT_DIR = "syndication"
+MANIFEST_PATH = os.path.join(OUT_DIR, "manifest.json")
+
+SITE_URL = "https://cloude2970-design.github.io/zen-feeds/"
+FEED_TITLE = "Zen Feeds"
+FEED_DESCRIPTION = "Daily Mindful Moments. Curated wallpapers paired with short, zen-inspired essays."
+PAGE_SIZE = 50
+
+DEFAULT_DATE = datetime(2026, 2, 1, tzinfo=timezone.utc)
+
+FORMATS = {
+    "rss": ("rss.xml", "application/rss+xml"),
+    "atom": ("atom.xml", "application/atom+xml"),
+    "json": ("feed.json", "application/feed+json"),
+}
+
+
+def parse_date(value):
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value or '', fmt).replace(tzinfo=timezone.utc)
+        except ValueError:
+            continue
+    return DEFAULT_DATE
+
+
+def entry_link(entry):
+    return f"{SITE_URL}#{entry['id']}"
+
+
+def image_type(url):
+    path = url.split('?', 1)[0].lower()
+    if path.endswith('.png'):
+        return "image/png"
+    if path.endswith('.webp'):
+        return "image/webp"
+    return "image/jpeg"
+
+
+def article_html(entry):
+    parts = [f'<p><img src="{escape(entry["url"])}" alt="{escape(entry.get("title", ""))}"></p>']
+    if entry.get('summary'):
+        parts.append(f"<p><em>{escape(entry['summary'])}</em></p>")
+    article = entry.get('article')
+    if isinstance(article, dict):
+        if article.get('headline'):
+            parts.append(f"<h2>{escape(article['headline'])}</h2>")
+        for para in (article.get('content') or '').split('\n\n'):
+            if para.strip():
+                parts.append(f"<p>{escape(para.strip())}</p>")
+        if article.get('tips'):
+            parts.append('<ul>' + ''.join(f"<li>{escape(t)}</li>" for t in article['tips']) + '</ul>')
+    elif isinstance(article, str):
+        parts.extend(f"<p>{escape(p.strip())}</p>" for p in article.split('\n\n') if p.strip())
+    if entry.get('author'):
+        parts.append(f"<p>Photo by {escape(entry['author'])}</p>")
+    return ''.join(parts)
+
+
+def page_url(fmt, page):
+    """Public URL of an archive page (None for the subscription document)."""
+    name, _ = FORMATS[fmt]
+    if page is None:
+        return SITE_URL + f"{OUT_DIR}/{name}"
+    stem, ext = os.path.splitext(name)
+    return SITE_URL + f"{OUT_DIR}/archive/{stem}-{page:04d}{ext}"
+
+
+def page_path(fmt, page):
+    return page_url(fmt, page)[len(SITE_URL):]
+
+
+# --- streaming writers --------------------------------------------------------
+
+class _XMLWriter:
+    def __init__(self, out):
+        self.xml = XMLGenerator(out, 'utf-8', short_empty_elements=True)
+        self.xml.startDocument()
+
+    def start(self, name, attrs=None):
+        self.xml.startElement(name, attrs or {})
+
+    def end(self, name):
+        self.xml.endElement(name)
+
+    def element(self, name, text=None, attrs=None):
+        self.start(name, attrs)
+        if text is not None:
+            self.xml.characters(text)
+        self.end(name)
+
+    def close(self):
+        self.xml.endDocument()
+
+
+def write_rss(out, entries, links, updated):
+    w = _XMLWriter(out)
+    w.start("rss", {"version": "2.0", "xmlns:atom": "http://www.w3.org/2005/Atom"})
+    w.start("channel")
+    w.element("title", FEED_TITLE)
+    w.element("link", SITE_URL)
+    w.element("description", FEED_DESCRIPTION)
+    w.element("language", "en")
+    w.element("lastBuildDate", format_datetime(updated))
+    for rel, href in links:
+        w.element("atom:link", attrs={"rel": rel, "href": href, "type": FORMATS["rss"][1]})
+    for entry in entries:
+        w.start("item")
+        w.element("title", entry.get('title', ''))
+        w.element("link", entry_link(entry))
+        w.element("guid", entry['id'], {"isPermaLink": "false"})
+        w.element("pubDate", format_datetime(parse_date(entry.get('date'))))
+        w.element("description", article_html(entry))
+        if entry.get('category'):
+            w.element("category", entry['category'])
+        w.element("enclosure", attrs={"url": entry['url'], "length": "0", "type": image_type(entry['url'])})
+        w.end("item")
+    w.end("channel")
+    w.end("rss")
+    w.close()
+
+
+def write_atom(out, entries, links, updated):
+    w = _XMLWriter(out)
+    w.start("feed", {"xmlns": "http://www.w3.org/2005/Atom"})
+    w.element("title", FEED_TITLE)
+    w.element("subtitle", FEED_DESCRIPTION)
+    w.element("id", SITE_URL)
+    w.element("updated", updated.isoformat())
+    w.element("link", attrs={"rel": "alternate", "href": SITE_URL})
+    for rel, href in links:
+        w.element("link", attrs={"rel": rel, "href": href, "type": FORMATS["atom"][1]})
+    for entry in entries:
+        w.start("entry")
+        w.element("id", f"urn:zen-feeds:{entry['id']}")
+        w.element("title", entry.get('title', ''))
+        w.element("updated", parse_date(entry.get('date')).isoformat())
+        w.start("author")
+        w.element("name", entry.get('author') or 'Unknown')
+        w.end("author")
+        w.element("link", attrs={"rel": "alternate", "href": entry_link(entry)})
+        w.element("link", attrs={"rel": "enclosure", "href": entry['url'], "type": image_type(entry['url'])})
+        if entry.get('category'):
+            w.element("category", attrs={"term": entry['category']})
+        w.element("summary", entry.get('summary', ''))
+        w.element("content", article_html(entry), {"type": "html"})
+        w.end("entry")
+    w.end("feed")
+    w.close()
+
+
+def write_json_feed(out, entries, links, updated):
+    def put(text):
+        out.write(text.encode('utf-8'))
+
+    header = {
+        "version": "https://jsonfeed.org/version/1.1",
+        "title": FEED_TITLE,
+        "home_page_url": SITE_URL,
+        "description": FEED_DESCRIPTION,
+        "language": "en",
+    }
+    for rel, href in links:
+        if rel == "self":
+            header["feed_url"] = href
+        elif rel == "prev-archive":
+            # JSON Feed pages towards older items
+            header["next_url"] = href
+    put(json.dumps(header, ensure_ascii=False)[:-1] + ', "items": [')
+    for i, entry in enumerate(entries):
+        item = {
+            "id": entry['id'],
+            "url": entry_link(entry),
+            "title": entry.get('title', ''),
+            "summary": entry.get('summary', ''),
+            "content_html": article_html(entry),
+            "image": entry['url'],
+            "date_published": parse_date(entry.get('date')).isoformat(),
+            "authors": [{"name": entry.get('author') or 'Unknown'}],
+        }
+        if entry.get('category'):
+            item["tags"] = [entry['category']]
+        put((',\n' if i else '\n') + json.dumps(item, ensure_ascii=False))
+    put('\n]}\n')
+
+
+WRITERS = {"rss": write_rss, "atom": write_atom, "json": write_json_feed}
+
+
+# --- pagination ---------------------------------------------------------------
+
+def plan_pages(ids):
+    """Yield (page, ids, links_by_format) for the subscription doc and archives.
+
+    Archive pages hold PAGE_SIZE entries in feed order, newest entries last;
+    the subscription document (page None) holds the newest PAGE_SIZE entries.
+    Within every document entries are listed newest first.
+    """
+    archives = [ids[i:i + PAGE_SIZE] for i in range(0, len(ids), PAGE_SIZE)]
+    last = len(archives)
+
+    def links(fmt, page):
+        result = [("self", page_url(fmt, page))]
+        if page is None:
+            result.append(("current", page_url(fmt, None)))
+            if last:
+                result.append(("prev-archive", page_url(fmt, last)))
+            return result
+        result.append(("current", page_url(fmt, None)))
+        if page > 1:
+            result.append(("prev-archive", page_url(fmt, page - 1)))
+        if page < last:
+            result.append(("next-archive", page_url(fmt, page + 1)))
+        return result
+
+    yield None, list(reversed(ids[-PAGE_SIZE:])), {fmt: links(fmt, None) for fmt in FORMATS}
+    for n, page_ids in enumerate(archives, 1):
+        yield n, list(reversed(page_ids)), {fmt: links(fmt, n) for fmt in FORMATS}
+
+
+def page_hash(entries, links):
+    h = hashlib.sha256()
+    h.update(json.dumps(links, sort_keys=True).encode())
+    for entry in entries:
+        h.update(json.dumps(entry, sort_keys=True, ensure_ascii=False).encode())
+    return h.hexdigest()
+
+
+def export(feeds, manifest):
+    """Write every changed page; returns (new manifest, pages written)."""
+    ids = list(feeds)
+    new_manifest = {}
+    written = 0
+    for page, page_ids, links in plan_pages(ids):
+        entries = [feeds[i] for i in page_ids]
+        updated = max((parse_date(e.get('date')) for e in entries), default=DEFAULT_DATE)
+        for fmt, writer in WRITERS.items():
+            path = page_path(fmt, page)
+            digest = page_hash(entries, links[fmt])
+            new_manifest[path] = digest
+            if manifest.get(path) == digest and os.path.exists(path):
+                continue
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = path + ".tmp"
+            with open(tmp, 'wb') as out:
+                writer(out, entries, links[fmt], updated)
+            os.replace(tmp, path)
+            written += 1
+
+    # Drop archive pages that no longer exist (catalog shrank)
+    for path in set(manifest) - set(new_manifest):
+        if os.path.exists(path):
+            os.remove(path)
+    return new_manifest, written
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    os.chdir(os.path.dirname(script_dir))  # Go to zen-feeds root
+
+    with open(FEEDS_PATH, 'r') as f:
+        feeds = json.load(f)
+
+    manifest = {}
+    if os.path.exists(MANIFEST_PATH):
+        with open(MANIFEST_PATH, 'r') as f:
+            manifest = json.load(f)
+
+    manifest, written = export(feeds, manifest)
+
+    os.makedirs(OUT_DIR, exist_ok=True)
+    with open(MANIFEST_PATH, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    print(f"Exported {len(feeds)} entries: {written} of {len(manifest)} pages rewritten")
+
+
+if __name__ == "__main__":
+    main()
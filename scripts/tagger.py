@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""Multi-label category tagger for curation reasons, plus per-tag posting lists.
+
+The keyword table is compiled into one trie-shaped regex, so each reason is
+classified in a single scan no matter how many phrases the table holds.
+
+Usage: python scripts/tagger.py  (writes tags.json)
+"""
+import json
+import os
+import re
+from collections import Counter
+
+from curated_sources import iter_curated
+
+FEEDS_PATH = "feeds.json"
+TAGS_PATH = "tags.json"
+
+DEFAULT_CATEGORY = "nature"
+
+# Curation theme labels (lowercase) -> category. A reason that carries one is
+# filed under it no matter what its keywords say; the first listed wins.
+CURATION_THEMES = {
+    "zen/nature": "nature",
+    "food/culinary": "food",
+    "travel/landscape": "travel",
+}
+
+# Category -> keywords/phrases (lowercase). Order is the tie-break between
+# categories with the same number of hits.
+CATEGORY_KEYWORDS = {
+    "nature": [
+        "nature", "forest", "forests", "tree", "trees", "woods",
+        "mountain", "mountains", "lake", "river", "ocean", "sea", "beach",
+        "waterfall", "flower", "flowers", "blossom", "leaf", "leaves", "moss",
+        "sky", "cloud", "clouds", "sunrise", "sunset", "snow", "meadow",
+        "garden", "bamboo", "fog", "mist", "misty", "wildlife",
+    ],
+    "food": [
+        "food", "culinary", "coffee", "tea", "matcha",
+        "meal", "dish", "fruit", "fruits", "bread", "breakfast", "dessert",
+        "cooking", "kitchen", "bowl", "ingredients", "sushi", "ramen",
+    ],
+    "travel": [
+        "travel", "landscape", "landscapes", "city",
+        "street", "temple", "shrine", "village", "road", "journey",
+        "destination", "kyoto", "tokyo", "countryside", "harbor",
+    ],
+    "abstract": [
+        "abstract", "texture", "textures", "pattern", "patterns", "gradient",
+        "bokeh", "blur", "light trails", "macro", "fluid", "shapes",
+        "geometric", "reflection", "reflections",
+    ],
+    "architecture": [
+        "architecture", "architectural", "building", "buildings", "bridge",
+        "interior", "facade", "tower", "staircase", "stairs", "cathedral",
+        "skyline", "pagoda", "house",
+    ],
+    "minimal": [
+        "minimal", "minimalist", "minimalism", "negative space", "simple",
+        "simplicity", "clean lines", "monochrome", "empty", "solitude",
+        "lone", "single",
+    ],
+}
+
+
+def _trie_pattern(phrases):
+    """Build a regex from a trie of phrases (greedy, so longest match wins)."""
+    trie = {}
+    for phrase in phrases:
+        node = trie
+        for ch in phrase:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def build(node):
+        alts = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not alts:
+            return ''
+        if len(alts) == 1 and '' not in node:
+            return alts[0]
+        group = '(?:' + '|'.join(alts) + ')'
+        return group + '?' if '' in node else group
+
+    return build(trie)
+
+
+class Tagger:
+    """Keyword table compiled into a single regex, plus the curation themes."""
+
+    def __init__(self, table, themes=None, default=DEFAULT_CATEGORY):
+        self.default = default
+        self.order = {tag: i for i, tag in enumerate(table)}
+        self.phrase_tags = {}
+        for tag, phrases in table.items():
+            for phrase in phrases:
+                self.phrase_tags.setdefault(phrase.lower(), []).append(tag)
+        self.pattern = re.compile(r'\b(?:' + _trie_pattern(self.phrase_tags) + r')\b')
+        self.themes = themes or {}
+        self.theme_order = {theme: i for i, theme in enumerate(self.themes)}
+        self.theme_pattern = (re.compile(r'\b(?:' + _trie_pattern(self.themes) + r')\b')
+                              if self.themes else None)
+
+    def theme(self, text):
+        """Category of the first-listed curation theme in text, or None."""
+        if not self.theme_pattern:
+            return None
+        found = {m.group() for m in self.theme_pattern.finditer(text.lower())}
+        if not found:
+            return None
+        return self.themes[min(found, key=self.theme_order.get)]
+
+    def tags(self, text):
+        """All matching tags: the curation theme first, then most keyword hits first."""
+        hits = Counter()
+        for match in self.pattern.finditer(text.lower()):
+            hits.update(self.phrase_tags[match.group()])
+        tags = sorted(hits, key=lambda tag: (-hits[tag], self.order[tag]))
+        theme = self.theme(text)
+        if theme:
+            tags = [theme] + [tag for tag in tags if tag != theme]
+        return tags
+
+    def primary(self, text):
+        tags = self.tags(text)
+        return tags[0] if tags else self.default
+
+
+TAGGER = Tagger(CATEGORY_KEYWORDS, CURATION_THEMES)
+
+
+def build_postings(feeds, curated):
+    """Map each tag to the sorted feed IDs carrying it.
+
+    An entry is tagged with its feed category plus every tag found in its
+    curation reason.
+    """
+    postings = {tag: [] for tag in CATEGORY_KEYWORDS}
+    reasons = {}
+    for item in curated:
+        if item['id'] in feeds:
+            reasons[item['id']] = item.get('reason', '')
+    for feed_id in sorted(feeds):
+        tags = [feeds[feed_id].get('category', DEFAULT_CATEGORY)]
+        tags += [t for t in TAGGER.tags(reasons.get(feed_id, '')) if t not in tags]
+        for tag in tags:
+            postings.setdefault(tag, []).append(feed_id)
+    return postings
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    os.chdir(os.path.dirname(script_dir))  # Go to zen-feeds root
+
+    with open(FEEDS_PATH, 'r') as f:
+        feeds = json.load(f)
+
+    postings = build_postings(feeds, iter_curated())
+
+    with open(TAGS_PATH, 'w') as f:
+        json.dump(postings, f, separators=(',', ':'))
+
+    for tag, ids in postings.items():
+        print(f"{tag}: {len(ids)}")
+    print(f"Wrote {TAGS_PATH}")
+
+
+if __name__ == "__main__":
+    main()
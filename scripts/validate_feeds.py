@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""Validate feeds.json before it is published.
+
+The feed is streamed record by record (the whole file is never loaded), and
+each field is checked by a precompiled rule from FIELD_CHECKS, so every
+violation is reported in one linear pass. Besides the seen-ID set, memory
+stays bounded by one record and the first MAX_REPORTED violations.
+
+Checks: the dict key matches the record's `id` and is not repeated; required
+fields are present (sync_from_curated.py leaves out `category` and
+`article`); categories are known to the tagger; URLs are absolute http(s);
+scores, dates, articles and the optional width/height are well-formed; no
+unknown fields.
+
+The build runs this as the gate before the publishing stages.
+
+Usage: python scripts/validate_feeds.py [--report validation.json] [FILE ...]
+"""
+import argparse
+import json
+import os
+import re
+import sys
+from collections import Counter
+from datetime import datetime
+
+from curated_sources import DATE_FORMATS, iter_json_object
+from tagger import CATEGORY_KEYWORDS
+
+FEEDS_PATH = "feeds.json"
+MAX_REPORTED = 50
+
+_ID = re.compile(r'[A-Za-z0-9_-]+\Z')
+_URL = re.compile(r'https?://[A-Za-z0-9.-]+(?::\d+)?(?:[/?#][^\s"<>]*)?\Z')
+CATEGORIES = frozenset(CATEGORY_KEYWORDS)
+
+
+def _text(value):
+    return isinstance(value, str) and value.strip() != ''
+
+
+def _date(value):
+    for fmt in DATE_FORMATS:
+        try:
+            datetime.strptime(value, fmt)
+            return True
+        except (TypeError, ValueError):
+            continue
+    return False
+
+
+def _int_between(low, high):
+    return lambda value: type(value) is int and low <= value <= high
+
+
+def _article(value):
+    return (isinstance(value, dict) and _text(value.get('headline')) and _text(value.get('content'))
+            and isinstance(value.get('tips'), list) and all(_text(t) for t in value['tips']))
+
+
+# field -> (required, check, message when the check fails)
+FIELD_CHECKS = {
+    "id": (True, lambda v: isinstance(v, str) and _ID.match(v), "not a valid id"),
+    "url": (True, lambda v: isinstance(v, str) and _URL.match(v), "not an absolute http(s) URL"),
+    "author": (True, _text, "empty or not a string"),
+    "title": (True, _text, "empty or not a string"),
+    "summary": (True, _text, "empty or not a string"),
+    "score": (True, _int_between(0, 100), "not an integer from 0 to 100"),
+    "date": (True, _date, "not a recognized date"),
+    "category": (True, lambda v: v in CATEGORIES, "unknown category"),
+    "article": (True, _article, "needs headline, content and a list of tips"),
+    # Optional: written by image_dims.py
+    "width": (False, _int_between(1, 1 << 16), "not a positive pixel size"),
+    "height": (False, _int_between(1, 1 << 16), "not a positive pixel size"),
+}
+REQUIRED = [field for field, (required, _, _) in FIELD_CHECKS.items() if required]
+
+
+def check_record(key, record):
+    """Yield (field, message) for every violation in one record."""
+    if not isinstance(record, dict):
+        yield "", "record is not an object"
+        return
+    if record.get('id') != key:
+        yield "id", f"does not match its key ({record.get('id')!r})"
+    for field in REQUIRED:
+        if field not in record:
+            yield field, "missing"
+    for field, value in record.items():
+        rule = FIELD_CHECKS.get(field)
+        if rule is None:
+            yield field, "unknown field"
+        elif not rule[1](value):
+            yield field, rule[2]
+    if ('width' in record) != ('height' in record):
+        yield "width", "width and height must be set together"
+
+
+def validate(path, max_reported=MAX_REPORTED):
+    """Check one feed file; returns (records, violation counts per field, first violations)."""
+    seen = set()
+    counts = Counter()
+    reported = []
+    records = 0
+
+    def report(key, field, message):
+        counts[field or "record"] += 1
+        if len(reported) < max_reported:
+            reported.append({"id": key, "field": field, "message": message})
+
+    for key, record in iter_json_object(path):
+        records += 1
+        if key in seen:
+            report(key, "id", "duplicate key")
+        seen.add(key)
+        for field, message in check_record(key, record):
+            report(key, field, message)
+    return records, counts, reported
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("files", nargs="*", help=f"feed files (default: {FEEDS_PATH})")
+    parser.add_argument("--report", help="also write the results as JSON to this path")
+    parser.add_argument("--max-reported", type=int, default=MAX_REPORTED,
+                        help="violations listed per file (all are counted)")
+    args = parser.parse_args()
+
+    if not args.files:
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        os.chdir(os.path.dirname(script_dir))  # Go to zen-feeds root
+        args.files = [FEEDS_PATH]
+
+    results = {}
+    failed = False
+    for path in args.files:
+        try:
+            records, counts, reported = validate(path, args.max_reported)
+        except (OSError, ValueError) as e:
+            print(f"{path}: {e}")
+            results[path] = {"error": str(e)}
+            failed = True
+            continue
+        total = sum(counts.values())
+        for v in reported:
+            print(f"{path}: {v['id']}: {v['field'] or 'record'}: {v['message']}")
+        if total > len(reported):
+            print(f"{path}: ... {total - len(reported)} more")
+        summary = ", ".join(f"{field} {n}" for field, n in counts.most_common())
+        print(f"{path}: {records} records, {total} violations" + (f" ({summary})" if summary else ""))
+        results[path] = {"records": records, "violations": dict(counts), "first": reported}
+        failed = failed or total > 0
+
+    if args.report:
+        tmp = args.report + ".tmp"
+        with open(tmp, 'w') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, args.report)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
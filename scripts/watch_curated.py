@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""Watch the curated sources and sync new images into feeds.json as they appear.
+
+Replaces cron-driven reruns of sync_new_curated.py: the feed and its ID index
+stay in memory, bursts of writes are debounced, and each change only builds
+and captions the curated items that are not in the feed yet.
+
+Each source remembers the byte offset of the last item it consumed and, on
+a change, reads and parses only the tail after it. That is the fast path for
+sources that grow at the end (JSON Lines logs, date-ordered arrays). A
+source kept sorted by score gets new items inserted, not appended: the bytes
+before the offset change, and it is rescanned from the start. The rescan is
+one linear pass, and items already in the feed are skipped by ID.
+
+Usage: python scripts/watch_curated.py
+"""
+import json
+import os
+import re
+import time
+
+from curated_sources import (CURATED_SOURCES, MERGE_ORDER, SORT_KEYS, computed_scores,
+                             with_computed_score)
+from generate_unique_captions import assign_unique_captions
+from sync_new_curated import OUTPUT_PATH, build_entries
+
+POLL_INTERVAL = 1.0  # seconds between stat() checks
+DEBOUNCE = 0.5       # sources must be quiet this long before syncing
+GUARD_BYTES = 256    # bytes before the offset that must be unchanged to read only the tail
+
+_SEPARATORS = re.compile(r'[\s,]*')
+
+
+def stat_key(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_size, st.st_mtime_ns)
+
+
+def snapshot(paths):
+    return {path: stat_key(path) for path in paths}
+
+
+class SourceTail:
+    """Reads the items appended to one curated source since the last read."""
+
+    def __init__(self, path):
+        self.path = path
+        self.offset = 0
+        self.guard = b''
+
+    def _rewritten(self, f, size):
+        if size < self.offset:
+            return True
+        f.seek(self.offset - len(self.guard))
+        return f.read(len(self.guard)) != self.guard
+
+    def read_new(self):
+        """Items added since the last call (all items on the first call)."""
+        with open(self.path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if self.offset and self._rewritten(f, size):
+                print(f"{self.path} was rewritten, rescanning")
+                self.offset, self.guard = 0, b''
+            f.seek(self.offset)
+            tail = f.read()
+            if self.path.endswith('.jsonl'):
+                items, consumed = self._parse_lines(tail)
+            else:
+                items, consumed = self._parse_array(tail)
+            self.offset += consumed
+            f.seek(max(0, self.offset - GUARD_BYTES))
+            self.guard = f.read(self.offset - max(0, self.offset - GUARD_BYTES))
+        return items
+
+    @staticmethod
+    def _parse_lines(tail):
+        # Only complete lines; a line still being written is read next time
+        end = tail.rfind(b'\n') + 1
+        items = [json.loads(line) for line in tail[:end].splitlines() if line.strip()]
+        return items, end
+
+    def _parse_array(self, tail):
+        text = tail.decode('utf-8', 'ignore')
+        pos = _SEPARATORS.match(text).end()
+        if self.offset == 0:
+            if not text.startswith('[', pos):
+                raise ValueError(f"{self.path}: expected a JSON array")
+            pos += 1
+        decoder = json.JSONDecoder()
+        items, consumed, counted = [], 0, 0
+        while True:
+            pos = _SEPARATORS.match(text, pos).end()
+            if pos >= len(text) or text[pos] == ']':
+                break
+            try:
+                item, end = decoder.raw_decode(text, pos)
+            except json.JSONDecodeError:
+                break  # mid-write; picked up on the next change
+            if end == len(text):
+                break
+            items.append(item)
+            pos = end
+            # Byte offset of pos, counting only the text since the last item
+            consumed += len(text[counted:pos].encode('utf-8'))
+            counted = pos
+        return items, consumed
+
+
+class FeedIndex:
+    """In-memory feeds.json plus the indexes needed for incremental syncs."""
+
+    def __init__(self, path):
+        self.path = path
+        self.load()
+
+    def load(self):
+        with open(self.path, 'r') as f:
+            self.feeds = json.load(f)
+        self.ids = set(self.feeds)
+        self.titles = {entry.get('title') for entry in self.feeds.values()}
+        self.stamp = stat_key(self.path)
+
+    def refresh(self):
+        """Reload if another tool rewrote feeds.json behind our back."""
+        if stat_key(self.path) != self.stamp:
+            print(f"{self.path} changed on disk, reloading")
+            self.load()
+
+    def add(self, entries):
+        assign_unique_captions(entries.values(), self.titles)
+        self.feeds.update(entries)
+        self.ids.update(entries)
+        tmp = self.path + ".tmp"
+        with open(tmp, 'w') as f:
+            json.dump(self.feeds, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, self.path)
+        self.stamp = stat_key(self.path)
+
+
+def sync(index, tails):
+    """Add newly appended curated items missing from the feed. Returns the number added."""
+    index.refresh()
+    appended = [item for tail in tails for item in tail.read_new()]
+    if not appended:
+        return 0
+    scores = computed_scores()
+    appended = [with_computed_score(item, scores) for item in appended]
+    # Same precedence as iter_curated(): best first, first occurrence of an ID wins
+    appended.sort(key=SORT_KEYS[MERGE_ORDER], reverse=True)
+    new_items = {}
+    for item in appended:
+        if item['id'] not in index.ids and item['id'] not in new_items:
+            new_items[item['id']] = item
+    if not new_items:
+        return 0
+    index.add(build_entries(list(new_items.values())))
+    return len(new_items)
+
+
+def wait_for_quiet(current):
+    """Debounce: block until the sources stop changing."""
+    while True:
+        time.sleep(DEBOUNCE)
+        settled = snapshot(CURATED_SOURCES)
+        if settled == current:
+            return settled
+        current = settled
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    os.chdir(os.path.dirname(script_dir))  # Go to zen-feeds root
+
+    index = FeedIndex(OUTPUT_PATH)
+    tails = [SourceTail(path) for path in CURATED_SOURCES]
+    print(f"Watching {', '.join(CURATED_SOURCES)} ({len(index.ids)} feeds loaded)")
+
+    synced = None
+    current = snapshot(CURATED_SOURCES)
+    try:
+        while True:
+            if current != synced:
+                current = wait_for_quiet(current)
+                try:
+                    added = sync(index, tails)
+                except (OSError, ValueError) as e:
+                    # Source missing or mid-write; retry on the next change
+                    print(f"Sync failed: {e}")
+                else:
+                    if added:
+                        print(f"Added {added} new images. Total feeds: {len(index.ids)}")
+                synced = current
+            time.sleep(POLL_INTERVAL)
+            current = snapshot(CURATED_SOURCES)
+    except KeyboardInterrupt:
+        print("Stopped.")
+
+
+if __name__ == "__main__":
+    main()
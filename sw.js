@@ -59,8 +59,8 @@ self.addEventListener('fetch', (event) => {
     return;
   }
   
-  // For feeds.json: network first with cache fallback
-  if (url.pathname.includes('feeds.json')) {
+  // For feeds.json and feeds.<locale>.json: network first with cache fallback
+  if (/feeds(\.[a-z]+)?\.json$/.test(url.pathname)) {
     event.respondWith(
       fetch(request).then((response) => {
         if (response.ok) {
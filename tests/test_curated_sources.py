@@ -0,0 +1,55 @@
+"""Tests for the chunked JSON readers shared by ingestion and the validator."""
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from curated_sources import iter_json_array, iter_json_object  # noqa: E402
+
+CHUNK_SIZES = (1, 2, 3, 7, 100)
+
+
+class ChunkedJSONTest(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def read(self, reader, text):
+        with open(self.path, 'w') as f:
+            f.write(text)
+        return [list(reader(self.path, chunk_size=n)) for n in CHUNK_SIZES]
+
+    def assertReads(self, reader, text, expected):
+        for n, result in zip(CHUNK_SIZES, self.read(reader, text)):
+            self.assertEqual(result, expected, f"chunk size {n}")
+
+    def assertRejects(self, reader, text):
+        with open(self.path, 'w') as f:
+            f.write(text)
+        for n in CHUNK_SIZES:
+            with self.assertRaises(ValueError, msg=f"{text!r}, chunk size {n}"):
+                list(reader(self.path, chunk_size=n))
+
+    def test_array(self):
+        self.assertReads(iter_json_array, '[1, 22, 333, {"a": [1, 2]}, "x"]',
+                         [1, 22, 333, {"a": [1, 2]}, "x"])
+        self.assertReads(iter_json_array, ' [ ] \n', [])
+
+    def test_object_keeps_duplicate_keys(self):
+        self.assertReads(iter_json_object, '{"a": 1, "bb": 22, "a": {"c": 333}}\n',
+                         [("a", 1), ("bb", 22), ("a", {"c": 333})])
+
+    def test_rejects_what_json_load_rejects(self):
+        for text in ('[1 2]', '[1,,2]', '[,1]', '[1,]', '[1] x', '[1]]', '[1', '[1,', ''):
+            self.assertRejects(iter_json_array, text)
+        for text in ('{"a": 1 "b": 2}', '{"a": 1,}', '{,"a": 1}', '{"a": 1} {}'):
+            self.assertRejects(iter_json_object, text)
+
+
+if __name__ == "__main__":
+    unittest.main()
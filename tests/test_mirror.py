@@ -0,0 +1,73 @@
+"""Offline tests for the mirror's disk budget (no network: responses are faked)."""
+import io
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from mirror import Mirror  # noqa: E402
+
+
+def body(n, size):
+    return io.BytesIO(bytes([n]) * size)
+
+
+class BudgetTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def fill(self, budget, count, size):
+        """A saved store holding `count` objects from an earlier run."""
+        mirror = Mirror(root=self.root, budget=budget)
+        for n in range(count):
+            sha, outcome = mirror._store(body(n, size))
+            self.assertEqual(outcome, "fetched")
+            mirror.urls[f"http://old/{n}"] = {"sha": sha, "etag": None, "last_modified": None}
+            mirror.objects[sha]['used'] = time.time() - 100 + n  # oldest first
+        mirror.save()
+        return mirror
+
+    def disk_usage(self):
+        objects = os.path.join(self.root, "objects")
+        return sum(os.path.getsize(os.path.join(d, f)) for d, _, files in os.walk(objects) for f in files)
+
+    def test_new_object_evicts_least_recently_used(self):
+        self.fill(budget=1000, count=3, size=300)
+        mirror = Mirror(root=self.root, budget=1000)
+        sha, outcome = mirror._store(body(9, 300))
+        self.assertEqual(outcome, "fetched")
+        self.assertIn(sha, mirror.objects)
+        self.assertEqual(len(mirror.objects), 3)
+        self.assertNotIn("http://old/0", mirror.urls)
+        self.assertIn("http://old/1", mirror.urls)
+        self.assertLessEqual(mirror.total, 1000)
+        self.assertEqual(self.disk_usage(), mirror.total)
+
+    def test_evicts_as_many_objects_as_needed(self):
+        self.fill(budget=1000, count=3, size=300)
+        mirror = Mirror(root=self.root, budget=1000)
+        _, outcome = mirror._store(body(9, 700))
+        self.assertEqual(outcome, "fetched")
+        self.assertEqual(sorted(mirror.urls), ["http://old/2"])
+        self.assertEqual(self.disk_usage(), 1000)
+
+    def test_objects_used_this_run_are_kept(self):
+        self.fill(budget=1000, count=3, size=300)
+        mirror = Mirror(root=self.root, budget=1000)
+        for n in range(3):
+            mirror.path(f"http://old/{n}")
+        sha, outcome = mirror._store(body(9, 300))
+        self.assertEqual((sha, outcome), (None, "over budget"))
+        self.assertEqual(len(mirror.urls), 3)
+        self.assertEqual(self.disk_usage(), 900)
+
+
+if __name__ == "__main__":
+    unittest.main()